@@ -15,10 +15,21 @@ def _use_immediate_task_backend(settings):
     settings.TASKS = {
         "default": {
             "BACKEND": "django_tasks.backends.immediate.ImmediateBackend",
+            "QUEUES": ["default", "io"],
         }
     }
 
 
+@pytest.fixture(autouse=True)
+def _reset_centroid_snapshots():
+    """Drop cached centroid matrices so no test sees another test's (rolled back) clusters."""
+    from canopyresearch.services.scoring.novelty import _centroid_snapshots
+
+    _centroid_snapshots.clear()
+    yield
+    _centroid_snapshots.clear()
+
+
 # Provider test data fixtures (for tests that prefer dependency injection)
 @pytest.fixture
 def rss_minimal():
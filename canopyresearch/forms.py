@@ -66,6 +66,10 @@ class SourceForm(forms.ModelForm):
         """Save form with parsed JSON config."""
         instance = super().save(commit=False)
         instance.config = self.cleaned_data["config_json"]
+        if {"config_json", "provider_type"} & set(self.changed_data):
+            # Validators belong to the old endpoint; force a full fetch next time
+            instance.http_etag = ""
+            instance.http_last_modified = ""
         if commit:
             instance.save()
         return instance
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("canopyresearch", "0012_document_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="source",
+            name="http_etag",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="source",
+            name="http_last_modified",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+def populate_has_embedding(apps, schema_editor):
+    """Flag existing documents that already have an embedding."""
+    Document = apps.get_model("canopyresearch", "Document")
+    Document.objects.exclude(embedding=[]).filter(embedding__isnull=False).update(
+        has_embedding=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("canopyresearch", "0014_embedding_cache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="has_embedding",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(populate_has_embedding, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="document",
+            index=models.Index(
+                condition=models.Q(("has_embedding", False)),
+                fields=["workspace"],
+                name="doc_pending_embedding_idx",
+            ),
+        ),
+    ]
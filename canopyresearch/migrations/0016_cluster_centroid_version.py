@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("canopyresearch", "0015_document_has_embedding"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cluster",
+            name="centroid_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("canopyresearch", "0016_cluster_centroid_version"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="embeddingcache",
+            name="unique_embedding_cache_hash_model",
+        ),
+        migrations.AddField(
+            model_name="embeddingcache",
+            name="api_base",
+            field=models.CharField(blank=True, default="", max_length=500),
+        ),
+        migrations.AddIndex(
+            model_name="embeddingcache",
+            index=models.Index(fields=["created_at"], name="canopyresea_created_f07e24_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="embeddingcache",
+            constraint=models.UniqueConstraint(
+                fields=("content_hash", "model_name", "api_base"),
+                name="unique_embedding_cache_hash_model_base",
+            ),
+        ),
+    ]
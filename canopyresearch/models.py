@@ -59,6 +59,9 @@ class Source(models.Model):
     auto_pause_threshold = models.IntegerField(default=5)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="healthy")
     weight = models.FloatField(default=1.0)  # Source weight for relevance scoring (default 1.0)
+    # Cache validators from the last successful fetch, sent back as a conditional GET
+    http_etag = models.CharField(max_length=255, blank=True, default="")
+    http_last_modified = models.CharField(max_length=64, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -95,6 +98,9 @@ class Document(models.Model):
     metadata = models.JSONField(default=dict, blank=True)  # Optional fields like author, tags
     summary = models.TextField(blank=True, default="")
     embedding = models.JSONField(default=list, blank=True)  # Placeholder for future embeddings
+    # Kept in sync with embedding by save(); lets queries find (un)embedded documents
+    # without reading the embedding column
+    has_embedding = models.BooleanField(default=False)
     content_hash = models.CharField(
         max_length=64, db_index=True, blank=True
     )  # Deduplication (SHA-256)
@@ -120,6 +126,11 @@ class Document(models.Model):
             models.Index(fields=["workspace", "-alignment"]),
             models.Index(fields=["workspace", "-velocity"]),
             models.Index(fields=["workspace", "-novelty"]),
+            models.Index(
+                fields=["workspace"],
+                condition=models.Q(has_embedding=False),
+                name="doc_pending_embedding_idx",
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -132,6 +143,13 @@ class Document(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.has_embedding = bool(self.embedding)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "embedding" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "has_embedding"}
+        super().save(*args, **kwargs)
+
 
 class DocumentSource(models.Model):
     """
@@ -210,6 +228,9 @@ class Cluster(models.Model):
     metrics_updated_at = models.DateTimeField(
         null=True, blank=True
     )  # When metrics were last computed
+    centroid_version = models.PositiveIntegerField(
+        default=0
+    )  # Incremented (with an F expression) on every centroid write; see centroid_snapshot
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -353,3 +374,35 @@ class WorkspaceSearchTerms(models.Model):
 
     def __str__(self):
         return f"{self.term} ({self.get_source_display()}) in {self.workspace.name}"
+
+
+class EmbeddingCache(models.Model):
+    """
+    Embedding vectors keyed by the SHA-256 of the embedded text, the model name, and
+    the API base URL (servers can serve different weights under the same model name).
+
+    Lets unchanged text (re-processing, re-ingestion, backfills) reuse its embedding
+    instead of calling the embedding backend again. Entries are pruned by age in
+    cleanup_old_documents.
+    """
+
+    content_hash = models.CharField(max_length=64)  # SHA-256 of the embedded text
+    model_name = models.CharField(max_length=200)
+    api_base = models.CharField(max_length=500, blank=True, default="")
+    dimension = models.PositiveIntegerField()
+    vector = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_hash", "model_name", "api_base"],
+                name="unique_embedding_cache_hash_model_base",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name} embedding {self.content_hash[:12]}"
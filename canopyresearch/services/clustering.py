@@ -5,9 +5,11 @@ Handles document-to-cluster assignment and centroid maintenance.
 """
 
 import logging
+from datetime import timedelta
 
 import numpy as np
 from django.db import transaction
+from django.db.models import Count, F, Q
 from django.utils import timezone
 
 from canopyresearch.models import Cluster, ClusterMembership, Document, Workspace
@@ -15,7 +17,8 @@ from canopyresearch.services.scoring import (
     compute_cluster_alignment_score,
     compute_cluster_velocity_score,
 )
-from canopyresearch.services.utils import cosine_similarity
+from canopyresearch.services.scoring.novelty import centroid_snapshot
+from canopyresearch.services.utils import cosine_similarity, unit_float32
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +29,17 @@ LABEL_CLUSTER_DEFAULT_MODEL = "gpt-4o-mini"
 DEFAULT_CLUSTER_THRESHOLD = 0.7
 
 
+def bump_centroid_version(cluster: Cluster) -> None:
+    """
+    Mark the cluster's centroid as rewritten (not saved).
+
+    Every centroid write must include centroid_version so centroid_snapshot caches in
+    other processes are invalidated. The increment is done in SQL, so concurrent
+    writers never collapse two bumps into one.
+    """
+    cluster.centroid_version = F("centroid_version") + 1
+
+
 def compute_cluster_centroid(cluster: Cluster) -> list[float] | None:
     """
     Recompute cluster centroid from member document embeddings.
@@ -36,13 +50,11 @@ def compute_cluster_centroid(cluster: Cluster) -> list[float] | None:
     Returns:
         Centroid vector or None if no members
     """
-    memberships = ClusterMembership.objects.filter(cluster=cluster).select_related("document")
-    embeddings = []
-
-    for membership in memberships:
-        doc = membership.document
-        if doc.embedding and isinstance(doc.embedding, list) and len(doc.embedding) > 0:
-            embeddings.append(doc.embedding)
+    # Only the embedding column of each member, not the whole document row
+    members = ClusterMembership.objects.filter(cluster=cluster).values_list(
+        "document__embedding", flat=True
+    )
+    embeddings = [embedding for embedding in members if embedding and isinstance(embedding, list)]
 
     if not embeddings:
         return None
@@ -85,25 +97,19 @@ def assign_document_to_cluster(
         # Lock the workspace to prevent concurrent cluster creation
         workspace = Workspace.objects.select_for_update().get(pk=workspace.pk)
 
-        # Find existing clusters in this workspace (inside transaction to see latest state)
-        clusters = Cluster.objects.filter(workspace=workspace).exclude(centroid=[])
-
+        # Nearest cluster via the cached unit centroid matrix: one matrix-vector product.
+        # Read inside the transaction so the snapshot's version check sees the latest state
         best_cluster = None
         best_similarity = -1.0
-
-        # Find nearest cluster
-        for cluster in clusters:
-            if (
-                not cluster.centroid
-                or not isinstance(cluster.centroid, list)
-                or len(cluster.centroid) == 0
-            ):
-                continue
-
-            similarity = cosine_similarity(document.embedding, cluster.centroid)
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_cluster = cluster
+        cluster_ids, centroids = centroid_snapshot(workspace.pk).get(
+            len(document.embedding), (None, None)
+        )
+        if cluster_ids is not None:
+            similarities = centroids @ unit_float32(document.embedding)
+            best = int(similarities.argmax())
+            best_similarity = float(similarities[best])
+            if best_similarity >= threshold:
+                best_cluster = Cluster.objects.get(pk=int(cluster_ids[best]))
 
         if best_cluster and best_similarity >= threshold:
             # Join existing cluster
@@ -129,31 +135,181 @@ def assign_document_to_cluster(
             return new_cluster
 
 
+def assign_documents_to_clusters_batch(
+    documents: list[Document], threshold: float = DEFAULT_CLUSTER_THRESHOLD
+) -> dict[int, Cluster | None]:
+    """
+    Batch version of assign_document_to_cluster for documents in one workspace.
+
+    Cluster centroids are loaded once into a normalized float32 matrix, so each
+    document's nearest-cluster search is one matrix-vector product. Documents are
+    still assigned in order: a cluster created for one document can be joined by
+    later documents in the same batch. Memberships are written with one bulk_create
+    and cluster sizes with one bulk_update.
+
+    Returns:
+        {document_id: assigned Cluster}, with None for documents without an embedding
+    """
+    assignments: dict[int, Cluster | None] = {document.id: None for document in documents}
+    embedded = []
+    for document in documents:
+        if document.embedding and isinstance(document.embedding, list):
+            embedded.append(document)
+        else:
+            logger.warning("Document %s has no embedding, skipping cluster assignment", document.id)
+    if not embedded:
+        return assignments
+
+    with transaction.atomic():
+        # Lock the workspace to prevent concurrent cluster creation
+        workspace = Workspace.objects.select_for_update().get(pk=embedded[0].workspace_id)
+
+        # {dimension: unit centroid matrix}; other dimensions can't match
+        candidates: dict[int, _CandidateMatrix] = {}
+        for cluster in Cluster.objects.filter(workspace=workspace).exclude(centroid=[]):
+            if isinstance(cluster.centroid, list) and cluster.centroid:
+                _add_candidate(candidates, cluster)
+
+        memberships = []
+        joined: dict[int, Cluster] = {}
+        for document in embedded:
+            vector = unit_float32(document.embedding)
+            candidate = candidates.get(len(vector))
+            if candidate is not None:
+                similarities = candidate.matrix @ vector
+                best = int(similarities.argmax())
+                if similarities[best] >= threshold:
+                    cluster = candidate.clusters[best]
+                    memberships.append(ClusterMembership(document=document, cluster=cluster))
+                    joined[cluster.id] = cluster
+                    assignments[document.id] = cluster
+                    logger.debug(
+                        "Assigned document %s to existing cluster %s (similarity=%.3f)",
+                        document.id,
+                        cluster.id,
+                        similarities[best],
+                    )
+                    continue
+
+            # Create new cluster (workspace is locked, so no concurrent creation possible)
+            cluster = Cluster.objects.create(
+                workspace=workspace, centroid=document.embedding, size=1
+            )
+            memberships.append(ClusterMembership(document=document, cluster=cluster))
+            _add_candidate(candidates, cluster)
+            assignments[document.id] = cluster
+            logger.debug("Created new cluster %s for document %s", cluster.id, document.id)
+
+        ClusterMembership.objects.bulk_create(memberships, ignore_conflicts=True)
+
+        # Refresh sizes of the existing clusters that gained members
+        if joined:
+            sizes = dict(
+                ClusterMembership.objects.filter(cluster_id__in=joined)
+                .values("cluster_id")
+                .annotate(n=Count("id"))
+                .values_list("cluster_id", "n")
+            )
+            now = timezone.now()
+            for cluster_id, cluster in joined.items():
+                cluster.size = sizes.get(cluster_id, 0)
+                # bulk_update skips auto_now
+                cluster.updated_at = now
+            Cluster.objects.bulk_update(list(joined.values()), ["size", "updated_at"])
+
+    return assignments
+
+
+class _CandidateMatrix:
+    """
+    Clusters of one dimension and their unit centroids as matrix rows.
+
+    Rows go into a preallocated buffer that doubles when full, so appending a cluster
+    created mid-batch is amortized O(1) rather than a copy of the whole matrix.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 16):
+        self.clusters: list[Cluster] = []
+        self._rows = np.empty((capacity, dimension), dtype=np.float32)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The filled rows (a view, not a copy)."""
+        return self._rows[: len(self.clusters)]
+
+    def append(self, cluster: Cluster, row: np.ndarray) -> None:
+        count = len(self.clusters)
+        if count == len(self._rows):
+            grown = np.empty((2 * count, self._rows.shape[1]), dtype=np.float32)
+            grown[:count] = self._rows
+            self._rows = grown
+        self._rows[count] = row
+        self.clusters.append(cluster)
+
+
+def _add_candidate(candidates: dict[int, _CandidateMatrix], cluster: Cluster) -> None:
+    """Append cluster's unit centroid to the candidate matrix for its dimension."""
+    row = unit_float32(cluster.centroid)
+    if len(row) not in candidates:
+        candidates[len(row)] = _CandidateMatrix(len(row))
+    candidates[len(row)].append(cluster, row)
+
+
 def reconcile_cluster_centroids(workspace=None):
     """
     Recompute all cluster centroids from member documents (integrity check).
 
+    Member embeddings are streamed in one query and summed per cluster, so memory
+    stays at one vector per cluster; sizes come from one annotated query and the
+    clusters are written back with a single bulk_update.
+
     Args:
         workspace: Optional workspace to limit reconciliation to
     """
     clusters = Cluster.objects.all()
     if workspace:
         clusters = clusters.filter(workspace=workspace)
+    clusters = list(clusters.annotate(member_total=Count("memberships")))
+
+    # {cluster_id: [sum of member embeddings, member count]}
+    sums: dict[int, list] = {}
+    members = (
+        ClusterMembership.objects.filter(cluster__in=[cluster.id for cluster in clusters])
+        .order_by("cluster_id", "id")
+        .values_list("cluster_id", "document__embedding")
+    )
+    for cluster_id, embedding in members.iterator(chunk_size=2000):
+        if embedding and isinstance(embedding, list):
+            vector = np.asarray(embedding, dtype=np.float64)
+            if cluster_id in sums:
+                sums[cluster_id][0] += vector
+                sums[cluster_id][1] += 1
+            else:
+                sums[cluster_id] = [vector, 1]
 
-    updated_count = 0
+    now = timezone.now()
+    updated, empty = [], []
     for cluster in clusters:
-        new_centroid = compute_cluster_centroid(cluster)
-        if new_centroid:
-            cluster.centroid = new_centroid
-            cluster.size = ClusterMembership.objects.filter(cluster=cluster).count()
-            cluster.save(update_fields=["centroid", "size", "updated_at"])
-            updated_count += 1
+        if cluster.id in sums:
+            total, count = sums[cluster.id]
+            cluster.centroid = (total / count).tolist()
+            bump_centroid_version(cluster)
+            cluster.size = cluster.member_total
+            # bulk_update skips auto_now
+            cluster.updated_at = now
+            updated.append(cluster)
         else:
             # No members, delete empty cluster
             logger.debug("Deleting empty cluster %s", cluster.id)
-            cluster.delete()
+            empty.append(cluster.id)
+
+    Cluster.objects.bulk_update(
+        updated, ["centroid", "centroid_version", "size", "updated_at"], batch_size=500
+    )
+    if empty:
+        Cluster.objects.filter(pk__in=empty).delete()
 
-    logger.info("Reconciled %d cluster centroids", updated_count)
+    logger.info("Reconciled %d cluster centroids", len(updated))
 
 
 def track_cluster_drift(cluster: Cluster) -> float | None:
@@ -275,15 +431,117 @@ def update_cluster_metrics(cluster: Cluster) -> dict:
     cluster.metrics_updated_at = timezone.now()
 
     # Save updated fields
-    update_fields = ["alignment", "velocity", "drift_distance", "metrics_updated_at", "centroid"]
+    # Save updated fields; the version bump invalidates centroid_snapshot caches
+    bump_centroid_version(cluster)
+    update_fields = [
+        "alignment",
+        "velocity",
+        "drift_distance",
+        "metrics_updated_at",
+        "centroid",
+        "centroid_version",
+        "updated_at",
+    ]
     if cluster.previous_centroid:
         update_fields.append("previous_centroid")
     cluster.save(update_fields=update_fields)
+    cluster.refresh_from_db(fields=["centroid_version"])
 
     logger.info("Updated metrics for cluster %s", cluster.id)
     return metrics
 
 
+def update_cluster_metrics_bulk(clusters, days_window: int = 7) -> dict[int, dict]:
+    """
+    Compute and update metrics for many clusters with a fixed number of queries.
+
+    Equivalent to calling update_cluster_metrics for each cluster, but membership
+    counts come from one annotated query, member embeddings from one streamed query,
+    and all clusters are written back with a single bulk_update.
+
+    Args:
+        clusters: QuerySet of clusters to update
+        days_window: Velocity time window in days
+
+    Returns:
+        Dict mapping cluster ID to its computed metrics (clusters that failed are omitted)
+    """
+    cutoff = timezone.now() - timedelta(days=days_window)
+    clusters = list(
+        clusters.select_related("workspace").annotate(
+            member_total=Count("memberships"),
+            member_recent=Count("memberships", filter=Q(memberships__assigned_at__gte=cutoff)),
+        )
+    )
+    if not clusters:
+        return {}
+
+    # Member embeddings for every cluster, grouped by cluster in one pass
+    embeddings: dict[int, list[list[float]]] = {}
+    members = (
+        ClusterMembership.objects.filter(cluster__in=[cluster.id for cluster in clusters])
+        .order_by("cluster_id", "id")
+        .values_list("cluster_id", "document__embedding")
+    )
+    for cluster_id, embedding in members.iterator(chunk_size=2000):
+        if embedding and isinstance(embedding, list):
+            embeddings.setdefault(cluster_id, []).append(embedding)
+
+    now = timezone.now()
+    results = {}
+    for cluster in clusters:
+        try:
+            # Same centroid refresh as compute_cluster_metrics
+            if cluster.id in embeddings:
+                current_centroid = np.mean(np.array(embeddings[cluster.id]), axis=0).tolist()
+                if cluster.centroid != current_centroid:
+                    if cluster.centroid:
+                        cluster.previous_centroid = cluster.centroid
+                    cluster.centroid = current_centroid
+
+            if cluster.member_total:
+                velocity = float(min(1.0, cluster.member_recent / cluster.member_total))
+            else:
+                velocity = 0.0
+
+            metrics = {
+                "alignment": compute_cluster_alignment_score(cluster),
+                "velocity": velocity,
+                "drift_distance": track_cluster_drift(cluster),
+            }
+        except Exception as e:
+            logger.exception("Failed to compute metrics for cluster %s: %s", cluster.id, e)
+            continue
+
+        cluster.alignment = metrics["alignment"]
+        cluster.velocity = metrics["velocity"]
+        cluster.drift_distance = metrics["drift_distance"]
+        cluster.metrics_updated_at = now
+        bump_centroid_version(cluster)
+        # bulk_update skips auto_now
+        cluster.updated_at = now
+        results[cluster.id] = metrics
+
+    updated = [cluster for cluster in clusters if cluster.id in results]
+    Cluster.objects.bulk_update(
+        updated,
+        [
+            "alignment",
+            "velocity",
+            "drift_distance",
+            "metrics_updated_at",
+            "centroid",
+            "centroid_version",
+            "previous_centroid",
+            "updated_at",
+        ],
+        batch_size=500,
+    )
+
+    logger.info("Updated metrics for %d clusters", len(updated))
+    return results
+
+
 def recompute_cluster_assignments(workspace: Workspace, threshold: float | None = None) -> dict:
     """
     Reassign all documents in a workspace to clusters.
@@ -299,7 +557,7 @@ def recompute_cluster_assignments(workspace: Workspace, threshold: float | None
         Dict with stats: {'documents_processed': int, 'clusters_created': int, 'clusters_merged': int}
     """
     # Get all documents with embeddings in this workspace
-    documents = workspace.documents.exclude(embedding=[]).filter(embedding__isnull=False)
+    documents = workspace.documents.filter(has_embedding=True)
 
     documents_processed = 0
     clusters_created = set()
@@ -10,6 +10,8 @@ Uses an OpenAI-compatible embeddings API. Configure via environment variables:
 Any OpenAI-compatible server works: OpenAI, Ollama, LM Studio, vLLM, etc.
 """
 
+import functools
+import hashlib
 import logging
 import os
 from abc import ABC, abstractmethod
@@ -34,6 +36,11 @@ class EmbeddingBackend(ABC):
         """Return a human-readable name/identifier for this backend."""
         raise NotImplementedError
 
+    @property
+    def api_base(self) -> str:
+        """Return the server URL, so cached vectors from different servers stay apart."""
+        return ""
+
     @abstractmethod
     def embed_texts(self, texts: list[str]) -> list[list[float]]:
         """
@@ -66,6 +73,7 @@ class OpenAIEmbeddingBackend(EmbeddingBackend):
         self._api_base = api_base or os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1")
         self._model = model or os.environ.get("EMBEDDING_MODEL", DEFAULT_MODEL)
         self._embedding_dim_cache: int | None = None
+        self._client = None
 
         if not self._api_key:
             raise RuntimeError(
@@ -77,6 +85,10 @@ class OpenAIEmbeddingBackend(EmbeddingBackend):
     def model_name(self) -> str:
         return self._model
 
+    @property
+    def api_base(self) -> str:
+        return self._api_base
+
     @property
     def embedding_dim(self) -> int:
         if self._embedding_dim_cache is None:
@@ -90,9 +102,12 @@ class OpenAIEmbeddingBackend(EmbeddingBackend):
         if not texts:
             return []
 
-        import openai
+        # Reuse one client so its HTTP connection pool stays warm between calls
+        if self._client is None:
+            import openai
 
-        client = openai.OpenAI(api_key=self._api_key, base_url=self._api_base)
+            self._client = openai.OpenAI(api_key=self._api_key, base_url=self._api_base)
+        client = self._client
         # Replace empty strings with a single space — the API rejects empty inputs
         inputs = [text if text and text.strip() else " " for text in texts]
 
@@ -101,11 +116,85 @@ class OpenAIEmbeddingBackend(EmbeddingBackend):
         return [list(item.embedding) for item in response.data]
 
 
+def embed_texts_cached(backend: EmbeddingBackend, texts: list[str]) -> list[list[float]]:
+    """
+    Embed texts, reusing EmbeddingCache entries for text this model (on this server)
+    has embedded before.
+
+    Looks up every text's SHA-256 in one query, sends only the misses to the backend,
+    and stores the new vectors. Returns embeddings in input order, like embed_texts.
+    """
+    from canopyresearch.models import EmbeddingCache
+
+    if not texts:
+        return []
+
+    hashes = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+    cached = dict(
+        EmbeddingCache.objects.filter(
+            model_name=backend.model_name,
+            api_base=backend.api_base,
+            content_hash__in=set(hashes),
+        ).values_list("content_hash", "vector")
+    )
+
+    # Embed each distinct uncached text once
+    missing = list(dict.fromkeys(h for h in hashes if h not in cached))
+    if missing:
+        text_by_hash = dict(zip(hashes, texts, strict=True))
+        vectors = backend.embed_texts([text_by_hash[h] for h in missing])
+        if len(vectors) != len(missing):
+            raise ValueError(
+                f"Embedding backend returned {len(vectors)} vectors for {len(missing)} texts"
+            )
+        new_entries = []
+        for content_hash, vector in zip(missing, vectors, strict=True):
+            cached[content_hash] = vector
+            if vector:
+                new_entries.append(
+                    EmbeddingCache(
+                        content_hash=content_hash,
+                        model_name=backend.model_name,
+                        api_base=backend.api_base,
+                        dimension=len(vector),
+                        vector=vector,
+                    )
+                )
+        # A concurrent worker may have cached the same text in the meantime
+        EmbeddingCache.objects.bulk_create(new_entries, ignore_conflicts=True)
+        logger.debug(
+            "Embedding cache: %d hits, %d misses", len(hashes) - len(missing), len(missing)
+        )
+
+    return [cached[h] for h in hashes]
+
+
+def prune_embedding_cache(older_than) -> int:
+    """Delete EmbeddingCache entries created before older_than. Returns the number deleted."""
+    from canopyresearch.models import EmbeddingCache
+
+    deleted, _ = EmbeddingCache.objects.filter(created_at__lt=older_than).delete()
+    if deleted:
+        logger.info("Pruned %d embedding cache entries", deleted)
+    return deleted
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_backend(api_key: str | None, api_base: str, model: str) -> EmbeddingBackend:
+    """One backend per configuration, so its client and probed dimension are reused."""
+    return OpenAIEmbeddingBackend(api_key=api_key, api_base=api_base, model=model)
+
+
 def get_embedding_backend() -> EmbeddingBackend:
     """
     Return a configured embedding backend.
 
     Reads OPENAI_API_KEY, OPENAI_API_BASE, and EMBEDDING_MODEL from the environment.
+    The backend is shared by every caller with the same configuration.
     Raises RuntimeError if OPENAI_API_KEY is not set.
     """
-    return OpenAIEmbeddingBackend()
+    return _cached_backend(
+        os.environ.get("OPENAI_API_KEY"),
+        os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1"),
+        os.environ.get("EMBEDDING_MODEL", DEFAULT_MODEL),
+    )
@@ -8,7 +8,6 @@ import logging
 import re
 
 import requests
-from lxml import html as lxml_html
 from readability import Document as ReadabilityDocument
 
 from canopyresearch.services.providers import (
@@ -16,6 +15,7 @@ from canopyresearch.services.providers import (
     MAX_RESPONSE_SIZE,
     USER_AGENT,
     _extract_links_from_html,
+    _html_to_text,
     _is_url_allowed,
 )
 
@@ -24,6 +24,11 @@ logger = logging.getLogger(__name__)
 # Maximum length for cleaned text (to prevent embedding issues with extremely long documents)
 MAX_CLEANED_TEXT_LENGTH = 10000
 
+# Whitespace patterns for normalize_text, compiled once
+_EXCESS_NEWLINES_RE = re.compile(r"\n{3,}")
+_INLINE_WHITESPACE_RE = re.compile(r"[ \t]+")
+_NEWLINE_PADDING_RE = re.compile(r" *\n *")
+
 
 def extract_html_to_text(html: str) -> str | None:
     """
@@ -39,8 +44,7 @@ def extract_html_to_text(html: str) -> str | None:
         summary_html = doc.summary()
         if not summary_html or not summary_html.strip():
             return None
-        tree = lxml_html.fromstring(summary_html)
-        text = tree.text_content() if tree is not None else ""
+        text = _html_to_text(summary_html)
         return text.strip() if text else None
     except (ValueError, TypeError, AttributeError) as e:
         logger.debug("Failed to extract text from HTML: %s", e)
@@ -59,12 +63,12 @@ def normalize_text(text: str) -> str:
         return ""
 
     # First, normalize excessive line breaks (more than 2 consecutive become 2)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _EXCESS_NEWLINES_RE.sub("\n\n", text)
 
     # Then normalize other whitespace: multiple spaces/tabs to single space
     # But preserve newlines - replace spaces/tabs with space, but keep newlines
-    text = re.sub(r"[ \t]+", " ", text)  # Multiple spaces/tabs to single space
-    text = re.sub(r" *\n *", "\n", text)  # Remove spaces around newlines
+    text = _INLINE_WHITESPACE_RE.sub(" ", text)  # Multiple spaces/tabs to single space
+    text = _NEWLINE_PADDING_RE.sub("\n", text)  # Remove spaces around newlines
 
     # Strip leading/trailing whitespace
     text = text.strip()
@@ -6,7 +6,10 @@ Handles document normalization, deduplication, persistence, and error resilience
 
 import hashlib
 import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
 from canopyresearch.models import Document, DocumentSource, IngestionLog, Source
@@ -14,6 +17,23 @@ from canopyresearch.services.providers import get_provider_class
 
 logger = logging.getLogger(__name__)
 
+# Values per IN (...) clause when looking up existing documents
+LOOKUP_CHUNK_SIZE = 500
+
+SOURCE_FETCH_WORKERS = 8  # concurrent provider fetches per workspace ingest
+
+# Source fields written by ingest_source on success or failure
+SOURCE_STATUS_FIELDS = [
+    "last_successful_fetch",
+    "last_fetched",
+    "consecutive_failures",
+    "status",
+    "last_error",
+    "http_etag",
+    "http_last_modified",
+    "updated_at",
+]
+
 
 def compute_hash(data: dict) -> str:
     """
@@ -36,14 +56,7 @@ def persist_document(workspace, source: Source, data: dict) -> bool:
 
     Raises ValueError if document is invalid (e.g., missing required fields like URL).
     """
-    # Validate required fields - at minimum, URL must be non-empty
-    url = data.get("url") or ""
-    if not url.strip():
-        external_id = data.get("external_id") or ""
-        raise ValueError(
-            f"Invalid document: missing required URL. "
-            f"external_id={external_id!r}, source={source.name!r}"
-        )
+    url = _validated_url(source, data)
 
     # Deduplicate by URL first — same URL with different content should not create a new document
     existing_by_url = Document.objects.filter(workspace=workspace, url=url).first()
@@ -73,19 +86,132 @@ def persist_document(workspace, source: Source, data: dict) -> bool:
 
     # Enqueue processing task for newly created documents
     if created:
-        from canopyresearch.tasks import task_process_document
+        _enqueue_processing(doc.id)
+
+    return created
+
+
+def persist_documents(workspace, source: Source, documents: list[dict]) -> int:
+    """
+    Persist a batch of normalized documents with the same rules as persist_document.
+
+    Existing documents are matched by URL, then content_hash, with one lookup per field;
+    new documents are inserted with a single bulk_create and every document is linked
+    to the source with another. Duplicates within the batch collapse onto the first
+    occurrence. Invalid documents (e.g., missing URL) are skipped with a warning.
 
+    Returns the number of new documents created.
+    """
+    candidates = []
+    for data in documents:
         try:
-            task_process_document.enqueue(document_id=doc.id)
-            logger.debug("Enqueued processing task for document %s", doc.id)
-        except Exception as e:
-            # Don't fail ingestion if task enqueue fails
-            logger.warning("Failed to enqueue processing task for document %s: %s", doc.id, e)
+            url = _validated_url(source, data)
+        except ValueError as e:
+            logger.warning("Skipping invalid document from source %s: %s", source.name, e)
+            continue
+        candidates.append((url, compute_hash(data), data))
+
+    if not candidates:
+        return 0
+
+    ids_by_url = _existing_document_ids(workspace, "url", {url for url, _, _ in candidates})
+    ids_by_hash = _existing_document_ids(
+        workspace, "content_hash", {content_hash for _, content_hash, _ in candidates}
+    )
+
+    now = timezone.now()
+    linked_ids: set[int] = set()
+    new_by_url: dict[str, Document] = {}
+    new_by_hash: dict[str, Document] = {}
+    for url, content_hash, data in candidates:
+        existing_id = ids_by_url.get(url) or ids_by_hash.get(content_hash)
+        if existing_id:
+            linked_ids.add(existing_id)
+            continue
+        if url in new_by_url or content_hash in new_by_hash:
+            continue
+        doc = Document(
+            workspace=workspace,
+            content_hash=content_hash,
+            external_id=data.get("external_id") or "",
+            title=data.get("title", ""),
+            url=url,
+            content=data.get("content", ""),
+            published_at=data.get("published_at") or now,
+            metadata=data.get("metadata", {}),
+            ingested_at=now,
+        )
+        new_by_url[url] = doc
+        new_by_hash[content_hash] = doc
+
+    new_docs = list(new_by_url.values())
+    try:
+        with transaction.atomic():
+            Document.objects.bulk_create(new_docs)
+            if any(doc.pk is None for doc in new_docs):
+                # Backends that can't return ids from a bulk insert
+                ids = _existing_document_ids(workspace, "content_hash", set(new_by_hash))
+                for content_hash, doc in new_by_hash.items():
+                    doc.pk = ids[content_hash]
+            DocumentSource.objects.bulk_create(
+                [
+                    DocumentSource(document_id=document_id, source=source)
+                    for document_id in linked_ids | {doc.pk for doc in new_docs}
+                ],
+                ignore_conflicts=True,
+            )
+    except IntegrityError:
+        # A concurrent ingestion inserted one of these documents first; fall back to
+        # per-document get_or_create, which resolves the race row by row
+        logger.info("Bulk insert for source %s conflicted, persisting one by one", source.name)
+        return sum(persist_document(workspace, source, data) for _, _, data in candidates)
+
+    for doc in new_docs:
+        _enqueue_processing(doc.pk)
+    return len(new_docs)
+
+
+def _validated_url(source: Source, data: dict) -> str:
+    """Return the document URL, raising ValueError if it is missing or blank."""
+    # Validate required fields - at minimum, URL must be non-empty
+    url = data.get("url") or ""
+    if not url.strip():
+        external_id = data.get("external_id") or ""
+        raise ValueError(
+            f"Invalid document: missing required URL. "
+            f"external_id={external_id!r}, source={source.name!r}"
+        )
+    return url
+
+
+def _existing_document_ids(workspace, field: str, values: set[str]) -> dict[str, int]:
+    """Map each value of field that already exists in the workspace to its document id."""
+    values = list(values)
+    found: dict[str, int] = {}
+    for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+        chunk = values[start : start + LOOKUP_CHUNK_SIZE]
+        found.update(
+            Document.objects.filter(workspace=workspace, **{f"{field}__in": chunk})
+            .order_by("-id")  # oldest document wins when a value repeats
+            .values_list(field, "id")
+            .iterator()
+        )
+    return found
 
-    return created
 
+def _enqueue_processing(document_id: int) -> None:
+    """Enqueue the processing pipeline for a newly created document."""
+    from canopyresearch.tasks import task_process_document
 
-def mark_source_error(source: Source, error: Exception) -> None:
+    try:
+        task_process_document.enqueue(document_id=document_id)
+        logger.debug("Enqueued processing task for document %s", document_id)
+    except Exception as e:
+        # Don't fail ingestion if task enqueue fails
+        logger.warning("Failed to enqueue processing task for document %s: %s", document_id, e)
+
+
+def mark_source_error(source: Source, error: Exception, save: bool = True) -> None:
     """Record error on source and optionally pause if threshold exceeded."""
     source.last_error = str(error)
     source.consecutive_failures += 1
@@ -93,51 +219,75 @@ def mark_source_error(source: Source, error: Exception) -> None:
         source.status = "paused"
     else:
         source.status = "error"
-    source.save(update_fields=["last_error", "consecutive_failures", "status", "updated_at"])
+    if save:
+        source.save(update_fields=["last_error", "consecutive_failures", "status", "updated_at"])
 
 
-def ingest_source(source: Source) -> tuple[int, int]:
-    """
-    Ingest documents from a single source.
-
-    Returns (documents_found, documents_created).
-    """
+def _start_ingestion(source: Source) -> IngestionLog | None:
+    """Open an IngestionLog for source, or return None if one is already in progress."""
     if IngestionLog.objects.filter(source=source, finished_at__isnull=True).exists():
         logger.info("Skipping source %s — ingestion already in progress", source.name)
-        return 0, 0
+        return None
 
-    started_at = timezone.now()
-    workspace = source.workspace
-    log = IngestionLog.objects.create(
+    return IngestionLog.objects.create(
         source=source,
-        started_at=started_at,
+        started_at=timezone.now(),
         documents_found=0,
         documents_created=0,
         status="success",
     )
 
+
+def _fetch_source(source: Source):
+    """
+    Fetch raw documents from the source's provider.
+
+    Network I/O only (no database access), so it is safe to run in a worker thread.
+    Returns (provider, raw_docs).
+    """
+    provider_class = get_provider_class(source.provider_type)
+    provider = provider_class(source)
+    return provider, provider.fetch()
+
+
+def ingest_source(source: Source, status_updates: list[Source] | None = None) -> tuple[int, int]:
+    """
+    Ingest documents from a single source.
+
+    If status_updates is given, the source's fetch status is set in memory and the
+    source appended to it instead of saved, so the caller can write many sources'
+    status with one bulk_update (see SOURCE_STATUS_FIELDS).
+
+    Returns (documents_found, documents_created).
+    """
+    log = _start_ingestion(source)
+    if log is None:
+        return 0, 0
+    return _complete_ingestion(source, log, lambda: _fetch_source(source), status_updates)
+
+
+def _complete_ingestion(
+    source: Source,
+    log: IngestionLog,
+    fetch: Callable[[], tuple],
+    status_updates: list[Source] | None = None,
+) -> tuple[int, int]:
+    """
+    Persist the result of fetch() for source and record the outcome on log and source.
+
+    fetch returns (provider, raw_docs); any exception it raises is recorded as a
+    source error and re-raised.
+    """
+    workspace = source.workspace
     try:
-        provider_class = get_provider_class(source.provider_type)
-        provider = provider_class(source)
-        raw_docs = provider.fetch()
+        provider, raw_docs = fetch()
         documents_found = len(raw_docs)
         log.documents_found = documents_found
         log.save(update_fields=["documents_found"])
 
-        documents_created = 0
-        for raw in raw_docs:
-            normalized = provider.normalize(raw)
-            try:
-                if persist_document(workspace, source, normalized):
-                    documents_created += 1
-            except ValueError as e:
-                # Skip invalid documents (e.g., missing required fields) and log
-                logger.warning(
-                    "Skipping invalid document from source %s: %s",
-                    source.name,
-                    e,
-                )
-                continue
+        # Invalid documents (e.g., missing required fields) are skipped and logged
+        normalized = [provider.normalize(raw) for raw in raw_docs]
+        documents_created = persist_documents(workspace, source, normalized)
 
         log.documents_created = documents_created
         log.finished_at = timezone.now()
@@ -147,15 +297,22 @@ def ingest_source(source: Source) -> tuple[int, int]:
         source.last_fetched = timezone.now()
         source.consecutive_failures = 0
         source.status = "healthy"
-        source.save(
-            update_fields=[
-                "last_successful_fetch",
-                "last_fetched",
-                "consecutive_failures",
-                "status",
-                "updated_at",
-            ]
-        )
+        if status_updates is None:
+            source.save(
+                update_fields=[
+                    "last_successful_fetch",
+                    "last_fetched",
+                    "consecutive_failures",
+                    "status",
+                    "http_etag",
+                    "http_last_modified",
+                    "updated_at",
+                ]
+            )
+        else:
+            # bulk_update skips auto_now, so stamp updated_at here
+            source.updated_at = timezone.now()
+            status_updates.append(source)
 
         logger.info(
             "Ingested source %s: found=%d created=%d",
@@ -166,7 +323,13 @@ def ingest_source(source: Source) -> tuple[int, int]:
         return documents_found, documents_created
 
     except Exception as e:
-        mark_source_error(source, e)
+        mark_source_error(source, e, save=status_updates is None)
+        if status_updates is not None:
+            # A successful fetch already stored new HTTP validators on source; put
+            # the old ones back so the next poll refetches what we failed to persist
+            source.refresh_from_db(fields=["http_etag", "http_last_modified"])
+            source.updated_at = timezone.now()
+            status_updates.append(source)
         log.finished_at = timezone.now()
         log.status = "error"
         log.error_message = str(e)
@@ -181,16 +344,35 @@ def ingest_workspace(workspace) -> dict[str, int]:
 
     Returns dict with sources_processed, documents_fetched, documents_saved, errors.
     """
-    sources = workspace.sources.filter(status="healthy")
     stats = {"sources_processed": 0, "documents_fetched": 0, "documents_saved": 0, "errors": 0}
 
-    for source in sources:
-        try:
-            found, created = ingest_source(source)
-            stats["documents_fetched"] += found
-            stats["documents_saved"] += created
+    # Open logs serially, skipping sources already being ingested elsewhere
+    started = []
+    for source in workspace.sources.filter(status="healthy"):
+        log = _start_ingestion(source)
+        if log is None:
             stats["sources_processed"] += 1
-        except Exception:
-            stats["errors"] += 1
+        else:
+            started.append((source, log))
+    if not started:
+        return stats
+
+    # Status writes for every source (success or error) go out in one bulk UPDATE
+    status_updates: list[Source] = []
+    # Provider HTTP fetches run concurrently; all database work stays on this thread
+    with ThreadPoolExecutor(max_workers=min(SOURCE_FETCH_WORKERS, len(started))) as pool:
+        futures = [pool.submit(_fetch_source, source) for source, _ in started]
+        try:
+            for (source, log), future in zip(started, futures, strict=True):
+                try:
+                    found, created = _complete_ingestion(source, log, future.result, status_updates)
+                    stats["documents_fetched"] += found
+                    stats["documents_saved"] += created
+                    stats["sources_processed"] += 1
+                except Exception:
+                    stats["errors"] += 1
+        finally:
+            if status_updates:
+                Source.objects.bulk_update(status_updates, SOURCE_STATUS_FIELDS)
 
     return stats
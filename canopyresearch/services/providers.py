@@ -5,18 +5,23 @@ Providers fetch raw documents and normalize them to the internal schema.
 The pipeline owns validation, hashing, deduplication, and persistence.
 """
 
+import functools
 import hashlib
 import ipaddress
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from datetime import timezone as dt_tz
+from email.utils import parsedate_to_datetime
 from typing import Any
-from urllib.parse import urlparse
+from urllib.parse import quote, urlparse
 
-import feedparser
 import requests
 from django.utils import timezone
+from lxml import etree
 from lxml import html as lxml_html
-from readability import Document as ReadabilityDocument
 
 from canopyresearch.models import Source
 
@@ -26,6 +31,35 @@ NORMALIZED_SCHEMA_KEYS = {"external_id", "title", "url", "content", "published_a
 USER_AGENT = "canopy-research/0.1"
 HTTP_TIMEOUT = 30
 MAX_RESPONSE_SIZE = 10 * 1024 * 1024  # 10MB max response size
+ARTICLE_FETCH_WORKERS = 8  # concurrent full-article extractions per feed
+
+# Subtrees that never contribute article text; stripped before text_content()
+NON_CONTENT_TAGS = ("script", "style", "noscript")
+
+# lxml parser instances must not be shared between threads, so keep one per thread
+_parser_local = threading.local()
+
+
+def _html_parser() -> lxml_html.HTMLParser:
+    """Return this thread's HTML parser (comments are dropped at parse time)."""
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = lxml_html.HTMLParser(encoding="utf-8", remove_comments=True)
+        _parser_local.parser = parser
+    return parser
+
+
+def _html_to_text(html: str) -> str:
+    """Parse an HTML fragment and return its text, ignoring script/style/noscript."""
+    tree = lxml_html.fromstring(html, parser=_html_parser())
+    etree.strip_elements(tree, *NON_CONTENT_TAGS, with_tail=False)
+    return tree.text_content()
+
+
+# One IPv4 octet as ipaddress accepts it: 0-255, no leading zeros
+_OCTET = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+# Four octet labels bounded by a dot or the end of the hostname on both sides
+_EMBEDDED_IPV4_RE = re.compile(rf"(?<![^.]){_OCTET}(?:\.{_OCTET}){{3}}(?![^.])")
 
 
 def _is_url_allowed(url: str) -> bool:
@@ -73,17 +107,10 @@ def _is_url_allowed(url: str) -> bool:
             # Not an IP address, might be a hostname - allow it
             pass
 
-        # Check for IP patterns in hostname (e.g., "127.0.0.1.example.com").
-        # Single segments like "127" are not valid IPs, so check every 4 consecutive
-        # segments for IPv4.
-        parts = hostname.split(".")
-        for i in range(len(parts) - 3):
-            quad = ".".join(parts[i : i + 4])
-            try:
-                ipaddress.ip_address(quad)
-                return False
-            except ValueError:
-                continue
+        # Check for IP patterns in hostname (e.g., "127.0.0.1.example.com"): any four
+        # consecutive labels that together form a dotted-quad IPv4 address.
+        if _EMBEDDED_IPV4_RE.search(hostname):
+            return False
 
         return True
     except Exception:
@@ -114,11 +141,17 @@ def extract_article_content(url: str) -> str | None:
         if "text/html" not in content_type and "application/xhtml" not in content_type:
             return None
 
+        # Reject declared-oversize bodies before reading any of them
+        content_length = resp.headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) > MAX_RESPONSE_SIZE:
+            resp.close()
+            return None
+
         # Stream response content with size limit
         content_chunks = []
         total_size = 0
 
-        for chunk in resp.iter_content(chunk_size=8192):
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
             if chunk:
                 total_size += len(chunk)
                 if total_size > MAX_RESPONSE_SIZE:
@@ -134,12 +167,14 @@ def extract_article_content(url: str) -> str | None:
         except (UnicodeDecodeError, AttributeError):
             return None
 
+        # Imported lazily: readability is slow to import and only needed for full-text extraction
+        from readability import Document as ReadabilityDocument
+
         doc = ReadabilityDocument(html)
         summary_html = doc.summary()
         if not summary_html or not summary_html.strip():
             return None
-        tree = lxml_html.fromstring(summary_html)
-        text = tree.text_content() if tree is not None else ""
+        text = _html_to_text(summary_html)
         return text.strip() if text else None
     except (
         requests.RequestException,
@@ -149,6 +184,49 @@ def extract_article_content(url: str) -> str | None:
         return None
 
 
+def _attach_extracted_content(pending: list[tuple[dict[str, Any], str]]) -> None:
+    """
+    Run extract_article_content for each (raw_doc, url) pair on a small thread pool.
+
+    Article fetches are dominated by network waits, so overlapping them keeps a feed
+    with many entries from paying each request's latency in turn. Non-empty results
+    are stored on the raw doc as "extracted_content".
+    """
+    if not pending:
+        return
+    urls = [url for _, url in pending]
+    if len(pending) == 1:
+        texts = [extract_article_content(urls[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(ARTICLE_FETCH_WORKERS, len(pending))) as pool:
+            texts = list(pool.map(extract_article_content, urls))
+    for (raw, _), text in zip(pending, texts, strict=True):
+        if text:
+            raw["extracted_content"] = text
+
+
+_HTTP_SCHEMES = ("http://", "https://")
+
+# Compiled once; reused for every entry body
+_ANCHORS_XPATH = etree.XPath("//a[@href]")
+
+
+def _fast_netloc(url: str) -> str:
+    """
+    Return the netloc of an absolute http(s) URL without a full urlparse().
+
+    Equivalent to urlparse(url).netloc for "scheme://netloc/..." URLs: the netloc
+    runs from after "//" to the first "/", "?" or "#".
+    """
+    start = url.find("//") + 2
+    end = len(url)
+    for terminator in "/?#":
+        index = url.find(terminator, start, end)
+        if index != -1:
+            end = index
+    return url[start:end]
+
+
 def _extract_links_from_html(
     html: str, skip_same_domain: str | None = None
 ) -> list[tuple[str, str]]:
@@ -162,8 +240,8 @@ def _extract_links_from_html(
         return []
 
     try:
-        tree = lxml_html.fromstring(html)
-    except (ValueError, TypeError, lxml_html.etree.ParserError):
+        tree = lxml_html.fromstring(html, parser=_html_parser())
+    except (ValueError, TypeError, etree.ParserError):
         return []
 
     result: list[tuple[str, str]] = []
@@ -171,27 +249,23 @@ def _extract_links_from_html(
     base_domain = urlparse(skip_same_domain).netloc if skip_same_domain else None
 
     # Find all anchor tags with href attributes
-    for anchor in tree.xpath("//a[@href]"):
+    for anchor in _ANCHORS_XPATH(tree):
         href = anchor.get("href", "").strip()
-        if not href:
-            continue
 
-        # Only include http/https URLs
-        if not (href.startswith("http://") or href.startswith("https://")):
+        # Only include http/https URLs (also rejects empty hrefs)
+        if not href.startswith(_HTTP_SCHEMES):
             continue
 
-        # Skip duplicates
+        # Skip duplicates (paths and queries are case-sensitive, so compare exactly)
         if href in seen:
             continue
 
         # Skip same-domain links if requested
-        if skip_same_domain and base_domain:
-            link_domain = urlparse(href).netloc
-            if link_domain == base_domain:
-                continue
+        if base_domain and _fast_netloc(href) == base_domain:
+            continue
 
         # Extract link text (all text content within the anchor tag)
-        link_text = anchor.text_content().strip()
+        link_text = "".join(anchor.itertext()).strip()
 
         seen.add(href)
         result.append((href, link_text or href))
@@ -212,6 +286,33 @@ class BaseSourceProvider:
     def __init__(self, source: Source):
         self.source = source
 
+    @functools.cached_property
+    def _config(self) -> dict[str, Any]:
+        """Source config, read once per provider instance."""
+        return self.source.config or {}
+
+    def _conditional_get(self, url: str, headers: dict[str, str]) -> requests.Response | None:
+        """
+        GET url, sending the source's cached ETag/Last-Modified validators.
+
+        Returns None when upstream answers 304 Not Modified. On success the new
+        validators are stored on self.source; ingest_source persists them.
+        """
+        headers = dict(headers)
+        if self.source.http_etag:
+            headers["If-None-Match"] = self.source.http_etag
+        if self.source.http_last_modified:
+            headers["If-Modified-Since"] = self.source.http_last_modified
+
+        resp = requests.get(url, headers=headers, timeout=HTTP_TIMEOUT)
+        if resp.status_code == 304:
+            return None
+        resp.raise_for_status()
+
+        self.source.http_etag = resp.headers.get("ETag", "")
+        self.source.http_last_modified = resp.headers.get("Last-Modified", "")
+        return resp
+
     def fetch(self) -> list[dict[str, Any]]:
         """
         Fetch and return raw provider documents.
@@ -247,6 +348,29 @@ class BaseSourceProvider:
         raise NotImplementedError("Subclasses must implement search()")
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_datetime_string(value: str) -> datetime | None:
+    """
+    Parse an ISO 8601 or RFC 2822 date string to an aware datetime (UTC if no offset).
+
+    Cached because entries in one feed frequently share the same timestamp strings.
+    Returns None if the string is in neither format.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_tz.utc)
+    return parsed
+
+
 def _entry_to_raw(entry: Any) -> dict[str, Any]:
     """Convert feedparser entry to raw dict for normalize."""
     link = getattr(entry, "link", "") or ""
@@ -272,7 +396,7 @@ class RSSProvider(BaseSourceProvider):
 
     def fetch(self) -> list[dict[str, Any]]:
         """Fetch raw documents from an RSS feed."""
-        config = self.source.config or {}
+        config = self._config
         url = config.get("url")
         if not url:
             return []
@@ -283,14 +407,15 @@ class RSSProvider(BaseSourceProvider):
         max_links_per_entry = config.get("max_links_per_entry", 50)
         skip_same_domain = config.get("skip_same_domain")  # entry link for same-domain check
 
-        try:
-            resp = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=HTTP_TIMEOUT)
-            resp.raise_for_status()
-        except requests.RequestException:
-            raise
+        resp = self._conditional_get(url, {"User-Agent": USER_AGENT})
+        if resp is None:
+            return []
+
+        import feedparser
 
         parsed = feedparser.parse(resp.content)
         raw_docs: list[dict[str, Any]] = []
+        pending: list[tuple[dict[str, Any], str]] = []  # (raw doc, article URL) to extract
 
         for entry in parsed.entries:
             if extract_body_links:
@@ -302,7 +427,7 @@ class RSSProvider(BaseSourceProvider):
                     raw = {
                         "link": link_url,
                         "title": link_text or link_url,
-                        "id": hashlib.sha256(link_url.encode()).hexdigest()[:16],
+                        "id": hashlib.blake2b(link_url.encode(), digest_size=8).hexdigest(),
                         "guid": link_url,
                         "summary": "",
                         "description": "",
@@ -313,20 +438,17 @@ class RSSProvider(BaseSourceProvider):
                         "metadata": {"from_entry": getattr(entry, "title", "") or ""},
                     }
                     if fetch_full_article and link_url:
-                        extracted = extract_article_content(link_url)
-                        if extracted:
-                            raw["extracted_content"] = extracted
+                        pending.append((raw, link_url))
                     raw_docs.append(raw)
                 if emit_newsletter_entry:
                     raw_docs.append(_entry_to_raw(entry))
             else:
                 raw = _entry_to_raw(entry)
                 if fetch_full_article and raw.get("link"):
-                    extracted = extract_article_content(raw["link"])
-                    if extracted:
-                        raw["extracted_content"] = extracted
+                    pending.append((raw, raw["link"]))
                 raw_docs.append(raw)
 
+        _attach_extracted_content(pending)
         return raw_docs
 
     def normalize(self, raw_doc: dict[str, Any]) -> dict[str, Any]:
@@ -337,12 +459,12 @@ class RSSProvider(BaseSourceProvider):
                 timezone.make_aware(published) if timezone.is_naive(published) else published
             )
         elif hasattr(published, "tm_year"):  # time.struct_time from feedparser
-            from datetime import timezone as dt_tz
-
             dt = datetime(*published[:6])
             published_at = timezone.make_aware(dt, dt_tz.utc)
         else:
-            published_at = timezone.now()
+            # A date string feedparser couldn't parse; keep it rather than assume "now"
+            parsed = _parse_datetime_string(published) if isinstance(published, str) else None
+            published_at = parsed or timezone.now()
 
         content = raw_doc.get("extracted_content")
         if not content:
@@ -430,6 +552,8 @@ Format as JSON array only, no markdown or extra text."""
 
             import json
 
+            import feedparser
+
             feeds = json.loads(content)
 
             # Fetch sample entries from each feed
@@ -505,7 +629,7 @@ class HackerNewsProvider(BaseSourceProvider):
         - listing: "front_page" (default), "new", "ask_hn", "show_hn"
         - limit: Maximum number of results (default 50, max 100)
         """
-        config = self.source.config or {}
+        config = self._config
         listing = config.get("listing", "front_page")
         limit = min(config.get("limit", 50), 100)
         tags_override = config.get("tags")
@@ -536,8 +660,6 @@ class HackerNewsProvider(BaseSourceProvider):
 
         # Add keyword query if provided
         if query:
-            from urllib.parse import quote
-
             params.append(f"query={quote(query)}")
 
         # Add numeric filters for points and comments
@@ -552,12 +674,10 @@ class HackerNewsProvider(BaseSourceProvider):
 
         url = f"https://hn.algolia.com/api/v1/{endpoint}?{'&'.join(params)}"
 
-        try:
-            resp = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=HTTP_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json()
-        except (requests.RequestException, ValueError):
-            raise
+        resp = self._conditional_get(url, {"User-Agent": USER_AGENT})
+        if resp is None:
+            return []
+        data = resp.json()
 
         hits = data.get("hits", [])
         raw_docs: list[dict[str, Any]] = []
@@ -589,12 +709,9 @@ class HackerNewsProvider(BaseSourceProvider):
 
     def normalize(self, raw_doc: dict[str, Any]) -> dict[str, Any]:
         """Convert HN item to normalized schema. Supports both Algolia and Firebase shapes."""
-        from datetime import datetime as dt
-        from datetime import timezone as dt_tz
-
         time_val = raw_doc.get("created_at_i") or raw_doc.get("time")
         if time_val is not None:
-            published_at = dt.fromtimestamp(time_val, tz=dt_tz.utc)
+            published_at = datetime.fromtimestamp(time_val, tz=dt_tz.utc)
         else:
             published_at = timezone.now()
 
@@ -637,8 +754,6 @@ class HackerNewsProvider(BaseSourceProvider):
         Returns:
             List of raw HN story dicts
         """
-        from urllib.parse import quote
-
         if not terms:
             return []
 
@@ -723,7 +838,7 @@ class SubredditProvider(BaseSourceProvider):
 
     def fetch(self) -> list[dict[str, Any]]:
         """Fetch raw documents from a Reddit subreddit."""
-        config = self.source.config or {}
+        config = self._config
         subreddit = config.get("subreddit")
         if not subreddit:
             return []
@@ -760,12 +875,10 @@ class SubredditProvider(BaseSourceProvider):
             url = f"https://www.reddit.com/r/{subreddit}/{listing}.json?limit={limit}&t={timeframe}"
             headers = {"User-Agent": USER_AGENT}
 
-        try:
-            resp = requests.get(url, headers=headers, timeout=HTTP_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json()
-        except requests.RequestException:
-            raise
+        resp = self._conditional_get(url, headers)
+        if resp is None:
+            return []
+        data = resp.json()
 
         children = []
         if isinstance(data, dict):
@@ -803,13 +916,10 @@ class SubredditProvider(BaseSourceProvider):
 
     def normalize(self, raw_doc: dict[str, Any]) -> dict[str, Any]:
         """Convert Reddit post to normalized schema."""
-        from datetime import datetime as dt
-        from datetime import timezone as dt_tz
-
         created = raw_doc.get("created_utc")
         if created is not None:
             # created_utc is epoch seconds in UTC, so create UTC-aware datetime first
-            published_at = dt.fromtimestamp(created, tz=dt_tz.utc)
+            published_at = datetime.fromtimestamp(created, tz=dt_tz.utc)
             # Convert to default timezone for consistency with timezone.now()
             published_at = published_at.astimezone(timezone.get_default_timezone())
         else:
@@ -924,8 +1034,6 @@ class SubredditProvider(BaseSourceProvider):
         refresh_token: str | None,
     ) -> list[dict[str, Any]]:
         """Search within a specific subreddit."""
-        from urllib.parse import quote
-
         if use_oauth and refresh_token:
             token = _reddit_refresh_token(client_id, client_secret, refresh_token)
             base_url = "https://oauth.reddit.com"
@@ -940,7 +1048,7 @@ class SubredditProvider(BaseSourceProvider):
             resp = requests.get(url, headers=headers, timeout=HTTP_TIMEOUT)
             resp.raise_for_status()
             data = resp.json()
-        except requests.RequestException:
+        except (requests.RequestException, ValueError):
             return []
 
         children = data.get("data", {}).get("children", [])
@@ -977,8 +1085,6 @@ class SubredditProvider(BaseSourceProvider):
         refresh_token: str | None,
     ) -> list[dict[str, Any]]:
         """Search across all of Reddit."""
-        from urllib.parse import quote
-
         if use_oauth and refresh_token:
             token = _reddit_refresh_token(client_id, client_secret, refresh_token)
             base_url = "https://oauth.reddit.com"
@@ -993,7 +1099,7 @@ class SubredditProvider(BaseSourceProvider):
             resp = requests.get(url, headers=headers, timeout=HTTP_TIMEOUT)
             resp.raise_for_status()
             data = resp.json()
-        except requests.RequestException:
+        except (requests.RequestException, ValueError):
             return []
 
         children = data.get("data", {}).get("children", [])
@@ -1034,8 +1140,6 @@ class SubredditProvider(BaseSourceProvider):
         Returns:
             List of dicts with subreddit name, title, description, subscriber_count
         """
-        from urllib.parse import quote
-
         if not terms:
             return []
 
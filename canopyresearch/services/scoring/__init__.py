@@ -8,18 +8,36 @@ from canopyresearch.services.scoring.alignment import (
     compute_alignment_score,
     compute_cluster_alignment_score,
 )
+from canopyresearch.services.scoring.batch import (
+    compute_novelty_scores_bulk,
+    score_documents_bulk,
+)
 from canopyresearch.services.scoring.novelty import compute_novelty_score
-from canopyresearch.services.scoring.relevance import compute_relevance_score
+from canopyresearch.services.scoring.relevance import (
+    compute_feedback_bias_bulk,
+    compute_relevance_score,
+    compute_source_weight_bulk,
+    relevance_expression,
+    update_relevance_scores,
+)
 from canopyresearch.services.scoring.velocity import (
     compute_cluster_velocity_score,
     compute_velocity_score,
+    compute_velocity_scores_bulk,
 )
 
 __all__ = [
     "compute_alignment_score",
     "compute_cluster_alignment_score",
     "compute_cluster_velocity_score",
+    "compute_feedback_bias_bulk",
     "compute_novelty_score",
+    "compute_novelty_scores_bulk",
     "compute_relevance_score",
+    "compute_source_weight_bulk",
     "compute_velocity_score",
+    "compute_velocity_scores_bulk",
+    "relevance_expression",
+    "score_documents_bulk",
+    "update_relevance_scores",
 ]
@@ -7,7 +7,7 @@ Computes how well a document or cluster aligns with the workspace core centroid.
 import logging
 
 from canopyresearch.models import Cluster, Document, Workspace
-from canopyresearch.services.utils import cosine_similarity
+from canopyresearch.services.utils import cached_float32, unit_cosine
 
 logger = logging.getLogger(__name__)
 
@@ -46,9 +46,11 @@ def compute_alignment_score(document: Document, workspace: Workspace | None = No
         )
         return 0.0
 
-    # Compute cosine similarity
-    similarity = cosine_similarity(document.embedding, core_vector)
-    return float(similarity)
+    # Cosine similarity of the (cached) unit vectors is just their dot product
+    return unit_cosine(
+        cached_float32(document, "_embedding_unit", document.embedding, unit=True),
+        cached_float32(workspace, "_core_vector_unit", core_vector, unit=True),
+    )
 
 
 def compute_cluster_alignment_score(cluster: Cluster) -> float:
@@ -80,5 +82,7 @@ def compute_cluster_alignment_score(cluster: Cluster) -> float:
         return 0.0
 
     # Compute cosine similarity between cluster centroid and workspace core
-    similarity = cosine_similarity(cluster.centroid, core_vector)
-    return float(similarity)
+    return unit_cosine(
+        cached_float32(cluster, "_centroid_unit", cluster.centroid, unit=True),
+        cached_float32(workspace, "_core_vector_unit", core_vector, unit=True),
+    )
@@ -7,11 +7,82 @@ Redesigned to avoid self-cluster suppression by excluding the document's assigne
 
 import logging
 
-from canopyresearch.models import Cluster, Document
-from canopyresearch.services.utils import cosine_similarity
+import numpy as np
+from django.db.models import Count, Max, Sum
+
+from canopyresearch.models import Cluster, ClusterMembership, Document
+from canopyresearch.services.utils import cached_float32
 
 logger = logging.getLogger(__name__)
 
+# Workspaces whose centroid snapshots are kept in memory per process
+CENTROID_SNAPSHOT_WORKSPACES = 32
+
+# {workspace_id: ((cluster count, highest id, centroid version total), snapshot)}
+_centroid_snapshots: dict[int, tuple[tuple, dict[int, tuple[np.ndarray, np.ndarray]]]] = {}
+
+
+def _assigned_cluster_id(document: Document) -> int | None:
+    """Return the document's cluster id, reusing prefetched memberships when present."""
+    if "cluster_memberships" in getattr(document, "_prefetched_objects_cache", {}):
+        memberships = document.cluster_memberships.all()
+        return min(memberships, key=lambda m: m.pk).cluster_id if memberships else None
+    return (
+        ClusterMembership.objects.filter(document_id=document.pk)
+        .order_by("pk")
+        .values_list("cluster_id", flat=True)
+        .first()
+    )
+
+
+def centroid_snapshot(workspace_id: int) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+    """
+    Return the workspace's cluster centroids as {dimension: (cluster_ids, unit_matrix)}.
+
+    The float32 matrices have L2-normalized rows, so one matrix-vector product scores a
+    unit document vector against every cluster. Snapshots are kept in process memory and
+    rebuilt only when the clusters change, detected with a cheap aggregate query, so
+    invalidation also works across worker processes: count and highest id change when
+    clusters are added or removed (ids are never reused), and the centroid_version total
+    rises with every committed centroid write, whatever order writers commit in. Any
+    write to a cluster's centroid must therefore increment centroid_version with an F
+    expression (see bump_centroid_version in services.clustering).
+    """
+    version = tuple(
+        Cluster.objects.filter(workspace_id=workspace_id)
+        .aggregate(count=Count("id"), last=Max("id"), versions=Sum("centroid_version"))
+        .values()
+    )
+    cached = _centroid_snapshots.get(workspace_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    by_dimension: dict[int, tuple[list[int], list[list[float]]]] = {}
+    rows = (
+        Cluster.objects.filter(workspace_id=workspace_id)
+        .exclude(centroid=[])
+        .values_list("id", "centroid")
+    )
+    for cluster_id, centroid in rows:
+        if isinstance(centroid, list) and centroid:
+            ids, centroids = by_dimension.setdefault(len(centroid), ([], []))
+            ids.append(cluster_id)
+            centroids.append(centroid)
+
+    snapshot = {}
+    for dimension, (ids, centroids) in by_dimension.items():
+        matrix = np.asarray(centroids, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        snapshot[dimension] = (np.asarray(ids), matrix)
+
+    _centroid_snapshots.pop(workspace_id, None)
+    _centroid_snapshots[workspace_id] = (version, snapshot)
+    while len(_centroid_snapshots) > CENTROID_SNAPSHOT_WORKSPACES:
+        # Evict the least recently rebuilt workspace
+        del _centroid_snapshots[next(iter(_centroid_snapshots))]
+    return snapshot
+
 
 def compute_novelty_score(document: Document) -> float:
     """
@@ -37,43 +108,36 @@ def compute_novelty_score(document: Document) -> float:
         logger.debug("Document %s has no embedding, returning 0 novelty", document.id)
         return 0.0
 
-    workspace = document.workspace
-
-    # Find clusters in this workspace
-    clusters = Cluster.objects.filter(workspace=workspace).exclude(centroid=[])
+    snapshot = centroid_snapshot(document.workspace_id)
 
-    if not clusters.exists():
+    if not snapshot:
         # No clusters yet, document is maximally novel
         return 1.0
 
     # Get the document's assigned cluster (if any)
-    assigned_cluster_id = None
-    membership = document.cluster_memberships.first()
-    if membership:
-        assigned_cluster_id = membership.cluster_id
-
-    # Find nearest cluster (excluding assigned cluster)
-    best_similarity = -1.0
-    for cluster in clusters:
-        # Skip assigned cluster to avoid self-cluster suppression
-        if cluster.id == assigned_cluster_id:
-            continue
-
-        if (
-            not cluster.centroid
-            or not isinstance(cluster.centroid, list)
-            or len(cluster.centroid) == 0
-        ):
-            continue
-
-        similarity = cosine_similarity(document.embedding, cluster.centroid)
-        if similarity > best_similarity:
-            best_similarity = similarity
+    assigned_cluster_id = _assigned_cluster_id(document)
+
+    # Convert the document vector once rather than once per cluster
+    embedding = cached_float32(document, "_embedding_unit", document.embedding, unit=True)
+
+    # Centroids of another dimension can't be compared (similarity 0)
+    if len(embedding) not in snapshot:
+        return 1.0
+    cluster_ids, matrix = snapshot[len(embedding)]
+
+    # One (K, D) @ (D,) product yields every cosine; the assigned cluster is then
+    # dropped to avoid self-cluster suppression
+    similarities = matrix @ embedding
+    if assigned_cluster_id is not None:
+        similarities = similarities[cluster_ids != assigned_cluster_id]
 
     # If no other clusters exist (only assigned cluster), document is maximally novel
-    if best_similarity < 0:
+    if similarities.size == 0:
         return 1.0
 
+    # Clip into [0, 1]: negative similarity counts as unrelated, and float32 rounding
+    # can push an identical centroid just past 1.0
+    best_similarity = float(np.clip(similarities, 0.0, 1.0).max())
+
     # Novelty = 1 - similarity (so high similarity = low novelty)
-    novelty = 1.0 - max(0.0, best_similarity)
-    return float(novelty)
+    return 1.0 - best_similarity
@@ -6,7 +6,11 @@ Computes combined relevance score from alignment, velocity, and optional bias te
 
 import logging
 
-from canopyresearch.models import Document, WorkspaceCoreFeedback
+from django.db.models import Avg, Case, F, FloatField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from canopyresearch.models import Document, DocumentSource, WorkspaceCoreFeedback
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +20,9 @@ ALIGNMENT_WEIGHT = 0.70
 VELOCITY_WEIGHT = 0.20
 BIAS_WEIGHT = 0.10
 
+# Document ids per IN (...) clause in the bulk helpers
+BULK_ID_CHUNK = 500
+
 
 def normalize_alignment(alignment: float) -> float:
     """
@@ -73,12 +80,63 @@ def compute_source_weight(document: Document) -> float:
     return total_weight / len(sources)
 
 
+def _id_chunks(document_ids: list[int]):
+    """Yield document_ids in slices of BULK_ID_CHUNK."""
+    for start in range(0, len(document_ids), BULK_ID_CHUNK):
+        yield document_ids[start : start + BULK_ID_CHUNK]
+
+
+def compute_feedback_bias_bulk(document_ids: list[int], workspace) -> dict[int, float]:
+    """
+    Batch version of compute_feedback_bias.
+
+    Returns {document_id: bias} for every id, using one query per chunk of ids.
+    """
+    bias = dict.fromkeys(document_ids, 0.5)  # Neutral bias if no feedback
+    seen: set[int] = set()
+    for chunk in _id_chunks(document_ids):
+        rows = (
+            WorkspaceCoreFeedback.objects.filter(workspace=workspace, document_id__in=chunk)
+            .order_by("document_id", "-created_at", "-id")
+            .values_list("document_id", "vote")
+        )
+        for document_id, vote in rows:
+            # Rows are newest-first per document; only the most recent vote counts
+            if document_id not in seen:
+                seen.add(document_id)
+                bias[document_id] = 1.0 if vote == "up" else 0.0
+    return bias
+
+
+def compute_source_weight_bulk(document_ids: list[int]) -> dict[int, float]:
+    """
+    Batch version of compute_source_weight.
+
+    Returns {document_id: average source weight} for every id (1.0 without sources).
+    """
+    weights: dict[int, list[float]] = {}
+    for chunk in _id_chunks(document_ids):
+        rows = DocumentSource.objects.filter(document_id__in=chunk).values_list(
+            "document_id", "source__weight"
+        )
+        for document_id, weight in rows:
+            weights.setdefault(document_id, []).append(weight)
+    return {
+        document_id: (sum(weights[document_id]) / len(weights[document_id]))
+        if document_id in weights
+        else 1.0
+        for document_id in document_ids
+    }
+
+
 def compute_relevance_score(
     document: Document,
     workspace=None,
     alignment_weight: float = ALIGNMENT_WEIGHT,
     velocity_weight: float = VELOCITY_WEIGHT,
     bias_weight: float = BIAS_WEIGHT,
+    feedback_bias: float | None = None,
+    source_weight: float | None = None,
 ) -> float:
     """
     Compute combined relevance score for a document.
@@ -91,6 +149,8 @@ def compute_relevance_score(
         alignment_weight: Weight for alignment component (default 0.70)
         velocity_weight: Weight for velocity component (default 0.20)
         bias_weight: Weight for bias component (default 0.10)
+        feedback_bias: Precomputed feedback bias (e.g. from compute_feedback_bias_bulk)
+        source_weight: Precomputed source weight (e.g. from compute_source_weight_bulk)
 
     Returns:
         Relevance score between 0 and 1
@@ -113,8 +173,10 @@ def compute_relevance_score(
     align_norm = normalize_alignment(alignment)
 
     # Compute bias (feedback + source weight)
-    feedback_bias = compute_feedback_bias(document, workspace)
-    source_weight = compute_source_weight(document)
+    if feedback_bias is None:
+        feedback_bias = compute_feedback_bias(document, workspace)
+    if source_weight is None:
+        source_weight = compute_source_weight(document)
     # Combine feedback and source weight (source weight modulates feedback)
     bias = feedback_bias * source_weight
 
@@ -125,3 +187,54 @@ def compute_relevance_score(
     relevance = max(0.0, min(1.0, relevance))
 
     return float(relevance)
+
+
+def relevance_expression(
+    workspace,
+    alignment_weight: float = ALIGNMENT_WEIGHT,
+    velocity_weight: float = VELOCITY_WEIGHT,
+    bias_weight: float = BIAS_WEIGHT,
+):
+    """
+    SQL expression computing compute_relevance_score for each Document row.
+
+    Uses the stored alignment and velocity columns, the latest feedback vote and the
+    average source weight via correlated subqueries, so a whole queryset can be scored
+    (or updated) in one statement.
+    """
+    latest_vote_bias = (
+        WorkspaceCoreFeedback.objects.filter(workspace=workspace, document=OuterRef("pk"))
+        .order_by("-created_at", "-id")
+        .annotate(
+            bias=Case(When(vote="up", then=Value(1.0)), default=Value(0.0)),
+        )
+        .values("bias")[:1]
+    )
+    average_source_weight = (
+        DocumentSource.objects.filter(document=OuterRef("pk"))
+        .values("document")
+        .annotate(weight=Avg("source__weight"))
+        .values("weight")
+    )
+    feedback_bias = Coalesce(Subquery(latest_vote_bias), Value(0.5), output_field=FloatField())
+    source_weight = Coalesce(Subquery(average_source_weight), Value(1.0), output_field=FloatField())
+    align_norm = Greatest(Least((F("alignment") + 1.0) / 2.0, Value(1.0)), Value(0.0))
+    relevance = (
+        alignment_weight * align_norm
+        + velocity_weight * F("velocity")
+        + bias_weight * feedback_bias * source_weight
+    )
+    return Case(
+        When(Q(alignment__isnull=True) | Q(velocity__isnull=True), then=Value(0.0)),
+        default=Greatest(Least(relevance, Value(1.0)), Value(0.0)),
+        output_field=FloatField(),
+    )
+
+
+def update_relevance_scores(documents, workspace) -> int:
+    """
+    Recompute and store relevance for every document in the queryset with one UPDATE.
+
+    Returns the number of rows updated.
+    """
+    return documents.update(relevance=relevance_expression(workspace), updated_at=timezone.now())
@@ -7,12 +7,17 @@ Computes growth velocity metrics for documents and clusters.
 import logging
 from datetime import timedelta
 
+import numpy as np
+from django.db.models import Count, Q
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from canopyresearch.models import Cluster, ClusterMembership, Document
 
 logger = logging.getLogger(__name__)
 
+SECONDS_PER_DAY = 24 * 3600
+
 
 def compute_velocity_score(document: Document, days_window: int = 7) -> float:
     """
@@ -33,18 +38,42 @@ def compute_velocity_score(document: Document, days_window: int = 7) -> float:
     if not timestamp:
         return 0.0
 
-    now = timezone.now()
-    age = now - timestamp
+    # Score decreases linearly with age, clamped to [0, 1]
+    # Recent (0 days old) = 1.0, old (days_window days or more) = 0.0
+    days_old = (timezone.now() - timestamp).total_seconds() / SECONDS_PER_DAY
+    return min(1.0, max(0.0, 1.0 - days_old / days_window))
 
-    # If older than window, score is 0
-    if age > timedelta(days=days_window):
-        return 0.0
 
-    # Score decreases linearly with age
-    # Recent (0 days old) = 1.0, old (days_window days old) = 0.0
-    days_old = age.total_seconds() / (24 * 3600)
-    velocity = 1.0 - (days_old / days_window)
-    return max(0.0, float(velocity))
+def compute_velocity_scores_bulk(documents, days_window: int = 7) -> dict[int, float]:
+    """
+    Vectorized compute_velocity_score for every document in a queryset.
+
+    Fetches only (id, published_at or ingested_at) and scores them in one NumPy pass.
+
+    Returns:
+        {document_id: velocity}; documents without a timestamp score 0.0
+    """
+    rows = list(documents.order_by().values_list("id", Coalesce("published_at", "ingested_at")))
+    if not rows:
+        return {}
+
+    velocity = velocity_from_timestamps([ts for _, ts in rows], days_window)
+    return {document_id: float(v) for (document_id, _), v in zip(rows, velocity, strict=True)}
+
+
+def velocity_from_timestamps(timestamps: list, days_window: int = 7) -> np.ndarray:
+    """
+    Velocity for each timestamp (datetime or None) as one NumPy pass.
+
+    Same linear decay as compute_velocity_score; None scores 0.0.
+    """
+    # Epoch seconds stay in float64: float32 can't resolve seconds at current epochs
+    now = timezone.now().timestamp()
+    seconds = np.array(
+        [ts.timestamp() if ts is not None else np.nan for ts in timestamps], dtype=np.float64
+    )
+    days_old = (now - seconds) / SECONDS_PER_DAY
+    return np.nan_to_num(np.clip(1.0 - days_old / days_window, 0.0, 1.0), nan=0.0)
 
 
 def compute_cluster_velocity_score(cluster: Cluster, days_window: int = 7) -> float:
@@ -62,13 +91,13 @@ def compute_cluster_velocity_score(cluster: Cluster, days_window: int = 7) -> fl
     """
     cutoff = timezone.now() - timedelta(days=days_window)
 
-    # Count recent memberships
-    recent_memberships = ClusterMembership.objects.filter(
-        cluster=cluster, assigned_at__gte=cutoff
-    ).count()
-
-    # Count total memberships
-    total_memberships = ClusterMembership.objects.filter(cluster=cluster).count()
+    # Count total and recent memberships in one aggregate query
+    counts = ClusterMembership.objects.filter(cluster=cluster).aggregate(
+        total=Count("id"),
+        recent=Count("id", filter=Q(assigned_at__gte=cutoff)),
+    )
+    total_memberships = counts["total"]
+    recent_memberships = counts["recent"]
 
     if total_memberships == 0:
         return 0.0
@@ -7,51 +7,41 @@ Falls back gracefully (returns "") when no API key is configured or the call fai
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
 
-def summarize_document(document) -> str:
-    """
-    Generate a workspace-contextual summary for a document.
+def _summary_prompt(document, key_topics: str | None = None) -> str:
+    """Build the summary prompt for a document (queries search terms unless given)."""
+    workspace = document.workspace
+    if key_topics is None:
+        key_topics = _key_topics(workspace)
+    return (
+        f'You are a research assistant helping analyse content for a workspace called "{workspace.name}".\n\n'
+        f"Workspace description: {workspace.description or '(none)'}\n"
+        f"Key topics: {key_topics}\n\n"
+        f"Summarise the following article in 2-4 sentences. "
+        f"Focus on aspects relevant to the workspace topics. "
+        f"Be specific and informative — avoid vague generalisations.\n\n"
+        f"Title: {document.title}\n"
+        f"Content: {document.content[:3000]}\n\n"
+        f"Return only the summary text, no preamble."
+    )
 
-    Uses OPENAI_API_KEY, OPENAI_API_BASE, and TERM_EXTRACTION_MODEL env vars.
-    Returns "" if LLM is unavailable or the call fails.
-    """
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        logger.debug("OPENAI_API_KEY not set, skipping summarization for document %s", document.id)
-        return ""
 
-    try:
-        import openai
-    except ImportError:
-        logger.warning("openai package not installed, skipping summarization")
-        return ""
+def _key_topics(workspace) -> str:
+    """The workspace's top search terms, for the summary prompt."""
+    search_terms = list(
+        workspace.search_terms.order_by("-weight").values_list("term", flat=True)[:10]
+    )
+    return ", ".join(search_terms) if search_terms else "(none)"
 
-    try:
-        workspace = document.workspace
-        search_terms = list(
-            workspace.search_terms.order_by("-weight").values_list("term", flat=True)[:10]
-        )
-        key_topics = ", ".join(search_terms) if search_terms else "(none)"
-
-        prompt = (
-            f'You are a research assistant helping analyse content for a workspace called "{workspace.name}".\n\n'
-            f"Workspace description: {workspace.description or '(none)'}\n"
-            f"Key topics: {key_topics}\n\n"
-            f"Summarise the following article in 2-4 sentences. "
-            f"Focus on aspects relevant to the workspace topics. "
-            f"Be specific and informative — avoid vague generalisations.\n\n"
-            f"Title: {document.title}\n"
-            f"Content: {document.content[:3000]}\n\n"
-            f"Return only the summary text, no preamble."
-        )
 
-        api_base = os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1")
+def _complete_summary(client, prompt: str, document_id) -> str:
+    """Request a summary for a built prompt. No database access, so safe in a worker thread."""
+    try:
         model_name = os.environ.get("TERM_EXTRACTION_MODEL", "gpt-4o-mini")
-
-        client = openai.OpenAI(api_key=api_key, base_url=api_base)
         response = client.chat.completions.create(
             model=model_name,
             messages=[
@@ -68,6 +58,75 @@ def summarize_document(document) -> str:
         summary = response.choices[0].message.content.strip()
         return summary
 
+    except Exception as e:
+        logger.warning("Summarization failed for document %s: %s", document_id, e)
+        return ""
+
+
+def _summary_client():
+    """Return an OpenAI client, or None if summarization is unavailable."""
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        return None
+
+    try:
+        import openai
+    except ImportError:
+        logger.warning("openai package not installed, skipping summarization")
+        return None
+
+    api_base = os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1")
+    return openai.OpenAI(api_key=api_key, base_url=api_base)
+
+
+def summarize_document(document) -> str:
+    """
+    Generate a workspace-contextual summary for a document.
+
+    Uses OPENAI_API_KEY, OPENAI_API_BASE, and TERM_EXTRACTION_MODEL env vars.
+    Returns "" if LLM is unavailable or the call fails.
+    """
+    client = _summary_client()
+    if client is None:
+        logger.debug("Summarization unavailable, skipping document %s", document.id)
+        return ""
+
+    try:
+        prompt = _summary_prompt(document)
     except Exception as e:
         logger.warning("Summarization failed for document %s: %s", document.id, e)
         return ""
+    return _complete_summary(client, prompt, document.id)
+
+
+def summarize_documents(documents, max_workers: int = 8) -> list[str]:
+    """
+    Batch version of summarize_document: one summary per document, in order.
+
+    Prompts are built on the calling thread (search terms are read once per
+    workspace), then the chat requests run concurrently on up to max_workers
+    threads, which never touch the database.
+    """
+    documents = list(documents)
+    client = _summary_client()
+    if client is None or not documents:
+        logger.debug("Summarization unavailable, skipping %d documents", len(documents))
+        return [""] * len(documents)
+
+    topics: dict[int, str] = {}
+    prompts = []
+    for document in documents:
+        try:
+            if document.workspace_id not in topics:
+                topics[document.workspace_id] = _key_topics(document.workspace)
+            prompts.append(_summary_prompt(document, topics[document.workspace_id]))
+        except Exception as e:
+            logger.warning("Summarization failed for document %s: %s", document.id, e)
+            prompts.append(None)
+
+    def complete(item):
+        prompt, document = item
+        return "" if prompt is None else _complete_summary(client, prompt, document.id)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(documents))) as pool:
+        return list(pool.map(complete, zip(prompts, documents, strict=True)))
@@ -108,6 +108,14 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Web and db_worker processes share one file: WAL lets reads run alongside a
+        # write, IMMEDIATE takes the write lock up front (so a transaction waits for it
+        # rather than failing on upgrade), and writers wait up to 20s for each other
+        "OPTIONS": {
+            "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
     }
 }
 
@@ -155,9 +163,11 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Django Tasks (django-tasks-db) - database-backed background tasks
+# Tasks that mostly wait on HTTP (ingestion, embedding) run on the "io" queue, which
+# bin/start serves with more worker processes than the CPU-bound "default" queue.
 TASKS = {
     "default": {
         "BACKEND": "django_tasks_db.DatabaseBackend",
-        "QUEUES": ["default"],
+        "QUEUES": ["default", "io"],
     }
 }
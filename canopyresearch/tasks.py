@@ -5,86 +5,290 @@ Uses Django Tasks (django-tasks-db) for database-backed async execution.
 """
 
 import logging
-
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
+import openai
+import requests
+from django.db import NotSupportedError, connection, models, transaction
 from django_tasks import task
 
-from canopyresearch.models import Cluster, Document, Source, Workspace
+from canopyresearch.models import (
+    Cluster,
+    ClusterMembership,
+    Document,
+    Source,
+    Workspace,
+    WorkspaceCoreFeedback,
+)
 from canopyresearch.services.clustering import (
     assign_document_to_cluster,
+    assign_documents_to_clusters_batch,
     label_cluster,
     recompute_cluster_assignments,
     reconcile_cluster_centroids,
-    update_cluster_metrics,
+    update_cluster_metrics_bulk,
 )
 from canopyresearch.services.core import seed_workspace_core, update_workspace_core_centroid
-from canopyresearch.services.embeddings import get_embedding_backend
+from canopyresearch.services.embeddings import (
+    embed_texts_cached,
+    get_embedding_backend,
+    prune_embedding_cache,
+)
 from canopyresearch.services.extraction import extract_and_clean_content, extract_links_from_url
 from canopyresearch.services.ingestion import ingest_source, ingest_workspace
 from canopyresearch.services.scoring import (
     compute_alignment_score,
     compute_novelty_score,
+    compute_novelty_scores_bulk,
     compute_relevance_score,
     compute_velocity_score,
+    score_documents_bulk,
+    update_relevance_scores,
 )
-from canopyresearch.services.summarization import summarize_document
+from canopyresearch.services.scoring.batch import SCORE_INPUT_FIELDS
+from canopyresearch.services.summarization import summarize_document, summarize_documents
+from canopyresearch.services.utils import cosine_similarity
 
 logger = logging.getLogger(__name__)
 
+# Queue for tasks dominated by network waits (feeds, content, embedding API)
+IO_QUEUE = "io"
 
-# Helper functions (not tasks) that can be called directly
-def _extract_and_embed_document(document_id: int) -> dict:
+# Transient network/API failures: network-bound tasks re-enqueue themselves on these
+RETRYABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+TASK_MAX_RETRIES = 5
+# Retry n runs RETRY_BASE_DELAY_SECONDS * 2**n seconds after the failed attempt
+RETRY_BASE_DELAY_SECONDS = 30
+
+# Documents per bulk_update / relevance UPDATE when recomputing novelty
+RELEVANCE_UPDATE_CHUNK = 500
+
+# Documents scored per score_documents_bulk call when rescoring a workspace
+SCORE_BATCH_SIZE = 500
+
+# Texts per embed_texts call when backfilling a workspace
+EMBED_BATCH_SIZE = 32
+# Concurrent content/link fetches while preparing an embedding batch
+EXTRACT_WORKERS = 8
+# Fields set by _apply_document_content, saved in the same write as the embedding.
+# content is added only when it was replaced (see _content_update_fields)
+DOCUMENT_CONTENT_FIELDS = ["summary", "metadata", "updated_at"]
+# Cleaned content replaces the stored content only if at least this much longer, so
+# marginal extraction differences don't rewrite a large TEXT column
+CONTENT_REPLACE_MIN_GROWTH = 1.1
+# Metadata keys owned by the embedding pipeline; only these are merged into the stored
+# metadata, so provider fields (author, tags, ...) written concurrently are kept
+PIPELINE_METADATA_KEYS = ("extracted_links", "embedding_model", "embedding_dim")
+# Columns loaded when embedding a batch: everything read or written, but not raw_payload
+# or the score columns. Written fields must be loaded, or bulk_update refetches them
+EMBED_INPUT_FIELDS = [
+    "id",
+    "workspace",
+    "title",
+    "url",
+    "content",
+    "summary",
+    "metadata",
+    "embedding",
+    "has_embedding",
+]
+
+# Core centroid moves smaller than this cosine distance skip the full workspace rescore
+CORE_RESCORE_EPSILON = 1e-4
+
+# Documents removed per transaction by cleanup_old_documents
+CLEANUP_BATCH_SIZE = 500
+
+
+class JSONMerge(models.Func):
     """
-    Extract clean content and compute embedding for a document.
+    Merge a dict's top-level keys into a JSON object column, in the database.
 
-    Helper function that can be called directly (not a task).
-    Returns dict with status and embedding metadata.
+    A partial update in place of read-modify-write: stored keys missing from the
+    patch are kept, even if another writer changed them after this row was read.
+    A NULL column is treated as {}.
     """
+
+    output_field = models.JSONField()
+
+    def __init__(self, expression, patch: dict):
+        super().__init__(expression, models.Value(patch, output_field=models.JSONField()))
+
+    def _merge_sql(self, compiler, template: str):
+        (column, column_params), (patch, patch_params) = (
+            compiler.compile(expression) for expression in self.get_source_expressions()
+        )
+        return template % (column, patch), (*column_params, *patch_params)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f"JSONMerge is not supported on {connection.vendor}")
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # JSON_PATCH (RFC 7396) also merges nested objects; pipeline values are never objects
+        return self._merge_sql(compiler, "JSON_PATCH(COALESCE(%s, '{}'), %s)")
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self._merge_sql(compiler, "JSON_MERGE_PATCH(COALESCE(%s, '{}'), %s)")
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self._merge_sql(compiler, "(COALESCE(%s, '{}'::jsonb) || %s)")
+
+
+@contextmanager
+def _merged_metadata(documents: list[Document]):
+    """
+    Write only the pipeline's metadata keys while saving the documents.
+
+    Inside the block each document's metadata is a JSONMerge of its
+    PIPELINE_METADATA_KEYS, so save() and bulk_update() merge those keys instead of
+    overwriting the column; the in-memory dicts are restored afterwards.
+    """
+    originals = [document.metadata for document in documents]
+    for document in documents:
+        metadata = document.metadata or {}
+        document.metadata = JSONMerge(
+            "metadata", {key: metadata[key] for key in PIPELINE_METADATA_KEYS if key in metadata}
+        )
     try:
-        document = Document.objects.get(pk=document_id)
-    except Document.DoesNotExist:
-        logger.error("Document %s not found", document_id)
-        return {"status": "error", "message": "Document not found"}
+        yield
+    finally:
+        for document, metadata in zip(documents, originals, strict=True):
+            document.metadata = metadata
+
+
+# Helper functions (not tasks) that can be called directly
+def _retry_later(task_to_retry, attempt: int, **kwargs) -> bool:
+    """
+    Re-enqueue a task after a transient failure, with exponential backoff.
 
+    The task must accept an attempt argument. Returns False (no retry) once
+    TASK_MAX_RETRIES is reached, or if the task backend cannot defer tasks.
+    """
+    from django.utils import timezone
+
+    if attempt >= TASK_MAX_RETRIES or not task_to_retry.get_backend().supports_defer:
+        return False
+    run_after = timezone.now() + timedelta(seconds=RETRY_BASE_DELAY_SECONDS * 2**attempt)
     try:
-        # Extract and clean content
-        cleaned_content = extract_and_clean_content(document.content, document.url)
-
-        # Update document content if cleaned version is better
-        if cleaned_content and len(cleaned_content) > len(document.content):
-            document.content = cleaned_content
-            document.save(update_fields=["content", "updated_at"])
-
-        # Extract links from the document URL and store in metadata
-        if document.url:
-            links = extract_links_from_url(document.url)
-            if not document.metadata:
-                document.metadata = {}
-            document.metadata["extracted_links"] = [
-                {"url": url, "text": text} for url, text in links
-            ]
-            document.save(update_fields=["metadata", "updated_at"])
+        task_to_retry.using(run_after=run_after).enqueue(attempt=attempt + 1, **kwargs)
+    except Exception as e:
+        logger.warning("Failed to enqueue retry of %s: %s", task_to_retry.name, e)
+        return False
+    logger.info("Retrying %s (%s) at %s", task_to_retry.name, kwargs, run_after)
+    return True
+
+
+def _fetch_document_content(document: Document) -> tuple[str, list[tuple[str, str]]]:
+    """
+    Fetch cleaned content and outbound links for a document.
 
-        # Generate workspace-contextual summary
+    Network/CPU only (no database access), so it is safe to run in a worker thread.
+    """
+    cleaned_content = extract_and_clean_content(document.content, document.url)
+    links = extract_links_from_url(document.url) if document.url else []
+    return cleaned_content, links
+
+
+def _apply_document_content(
+    document: Document, cleaned_content: str, links: list[tuple[str, str]], summarize: bool = True
+) -> str:
+    """
+    Set fetched content, links, and a summary on the document (not saved).
+
+    Callers write these fields (see _content_update_fields) together with the embedding.
+    With summarize=False the summary is left to the caller (see summarize_documents).
+    Returns the text to embed.
+    """
+    # Update document content if cleaned version is meaningfully longer
+    if (
+        cleaned_content
+        and cleaned_content != document.content
+        and len(cleaned_content) >= len(document.content) * CONTENT_REPLACE_MIN_GROWTH
+    ):
+        document.content = cleaned_content
+
+    # Store extracted links in metadata
+    if document.url:
+        if not document.metadata:
+            document.metadata = {}
+        document.metadata["extracted_links"] = [{"url": url, "text": text} for url, text in links]
+
+    # Generate workspace-contextual summary
+    if summarize:
         summary = summarize_document(document)
         if summary:
             document.summary = summary
-            document.save(update_fields=["summary", "updated_at"])
 
-        # Compute embedding
-        backend = get_embedding_backend()
-        embeddings = backend.embed_texts([cleaned_content or document.content])
+    return cleaned_content or document.content
 
-        if not embeddings or not embeddings[0]:
-            logger.warning("Failed to generate embedding for document %s", document_id)
-            return {"status": "error", "message": "Failed to generate embedding"}
 
-        # Store embedding and metadata
-        document.embedding = embeddings[0]
-        if not document.metadata:
-            document.metadata = {}
-        document.metadata["embedding_model"] = backend.model_name
-        document.metadata["embedding_dim"] = backend.embedding_dim
-        document.save(update_fields=["embedding", "metadata", "updated_at"])
+def _content_update_fields(content_replaced: bool) -> list[str]:
+    """Fields to save after _apply_document_content; content only if it was replaced."""
+    fields = list(DOCUMENT_CONTENT_FIELDS)
+    if content_replaced:
+        fields.append("content")
+    return fields
+
+
+def _set_embedding(document: Document, embedding: list[float], backend) -> None:
+    """Set the embedding and its model metadata on the document (not saved)."""
+    document.embedding = embedding
+    document.has_embedding = bool(embedding)
+    if not document.metadata:
+        document.metadata = {}
+    document.metadata["embedding_model"] = backend.model_name
+    document.metadata["embedding_dim"] = backend.embedding_dim
+
+
+def _extract_and_embed_document(
+    document_id: int | None = None, document: Document | None = None, save: bool = True
+) -> dict:
+    """
+    Extract clean content and compute embedding for a document.
+
+    Helper function that can be called directly (not a task).
+    Pass an already-loaded document to skip fetching it by id. With save=False the
+    fields are only set on the instance, for the caller to save with its own write.
+    Returns dict with status and embedding metadata.
+    """
+    if document is None:
+        try:
+            document = Document.objects.get(pk=document_id)
+        except Document.DoesNotExist:
+            logger.error("Document %s not found", document_id)
+            return {"status": "error", "message": "Document not found"}
+    document_id = document.pk
+
+    try:
+        original_content = document.content
+        text = _apply_document_content(document, *_fetch_document_content(document))
+
+        update_fields = _content_update_fields(document.content != original_content)
+        try:
+            # Compute embedding
+            backend = get_embedding_backend()
+            embeddings = embed_texts_cached(backend, [text])
+
+            if not embeddings or not embeddings[0]:
+                logger.warning("Failed to generate embedding for document %s", document_id)
+                return {"status": "error", "message": "Failed to generate embedding"}
+
+            _set_embedding(document, embeddings[0], backend)
+            update_fields += ["embedding", "has_embedding"]
+        finally:
+            # One write for the extracted content and, if it succeeded, the embedding
+            if save:
+                with _merged_metadata([document]):
+                    document.save(update_fields=update_fields)
 
         logger.info("Computed embedding for document %s", document_id)
         return {
@@ -94,20 +298,161 @@ def _extract_and_embed_document(document_id: int) -> dict:
         }
     except Exception as e:
         logger.exception("Failed to extract/embed document %s: %s", document_id, e)
-        return {"status": "error", "message": str(e)}
+        return {
+            "status": "error",
+            "message": str(e),
+            "retryable": isinstance(e, RETRYABLE_ERRORS),
+        }
+
+
+def _fetch_document_content_safe(document: Document):
+    """_fetch_document_content for a thread pool: returns the exception instead of raising."""
+    try:
+        return _fetch_document_content(document)
+    except Exception as e:
+        return e
+
+
+def _extract_and_embed_documents_batch(
+    document_ids: list[int], batch_size: int = EMBED_BATCH_SIZE
+) -> dict[int, dict]:
+    """
+    Batch version of _extract_and_embed_document.
 
+    Content, links, and summaries are fetched concurrently, each slice of batch_size
+    texts is embedded with one embed_texts call (texts already in EmbeddingCache are
+    skipped), and content and embeddings are written together with one bulk_update
+    per slice.
 
-def _assign_cluster(document_id: int) -> dict:
+    Returns {document_id: result dict} in the same shape as _extract_and_embed_document.
+    """
+    results, writes = _prepare_document_embeddings(document_ids, batch_size)
+    _save_document_embeddings(writes)
+    return results
+
+
+def _prepare_document_embeddings(
+    document_ids: list[int], batch_size: int = EMBED_BATCH_SIZE
+) -> tuple[dict[int, dict], list[tuple[list[Document], list[str]]]]:
+    """
+    The network half of _extract_and_embed_documents_batch: fetch, summarize, embed.
+
+    Fields are set on the loaded documents but not saved, so no transaction needs to
+    be open while the page fetches and API calls run. Returns the per-document results
+    and, per slice, the (documents, fields) for _save_document_embeddings to write.
+    """
+    from django.utils import timezone
+
+    documents = list(
+        Document.objects.select_related("workspace")
+        .only(*EMBED_INPUT_FIELDS)
+        .filter(pk__in=document_ids)
+    )
+    results: dict[int, dict] = {
+        document_id: {"status": "error", "message": "Document not found"}
+        for document_id in document_ids
+    }
+    writes: list[tuple[list[Document], list[str]]] = []
+    if not documents:
+        return results, writes
+
+    backend = get_embedding_backend()
+    for start in range(0, len(documents), batch_size):
+        batch = documents[start : start + batch_size]
+        with ThreadPoolExecutor(max_workers=min(EXTRACT_WORKERS, len(batch))) as pool:
+            fetched = list(pool.map(_fetch_document_content_safe, batch))
+
+        pending, texts = [], []
+        content_replaced = False
+        for document, content in zip(batch, fetched, strict=True):
+            try:
+                if isinstance(content, Exception):
+                    raise content
+                original_content = document.content
+                texts.append(_apply_document_content(document, *content, summarize=False))
+                pending.append(document)
+                content_replaced |= document.content != original_content
+            except Exception as e:
+                logger.exception("Failed to extract document %s: %s", document.id, e)
+                results[document.id] = {"status": "error", "message": str(e)}
+        if not pending:
+            continue
+
+        # Summary requests run concurrently; their prompts are built on this thread
+        for document, summary in zip(
+            pending, summarize_documents(pending, max_workers=EXTRACT_WORKERS), strict=True
+        ):
+            if summary:
+                document.summary = summary
+
+        try:
+            embeddings = embed_texts_cached(backend, texts)
+            if not embeddings or len(embeddings) != len(texts):
+                raise ValueError(
+                    f"Embedding backend returned {len(embeddings or [])} vectors "
+                    f"for {len(texts)} texts"
+                )
+            failure, retryable = "Failed to generate embedding", False
+        except Exception as e:
+            logger.exception("Failed to embed batch of %d documents: %s", len(texts), e)
+            embeddings = [None] * len(pending)
+            failure, retryable = str(e), isinstance(e, RETRYABLE_ERRORS)
+
+        embedded = 0
+        now = timezone.now()
+        for document, embedding in zip(pending, embeddings, strict=True):
+            # bulk_update skips auto_now
+            document.updated_at = now
+            if not embedding:
+                logger.warning("Failed to generate embedding for document %s", document.id)
+                results[document.id] = {
+                    "status": "error",
+                    "message": failure,
+                    "retryable": retryable,
+                }
+                continue
+            _set_embedding(document, embedding, backend)
+            embedded += 1
+            results[document.id] = {
+                "status": "success",
+                "embedding_dim": backend.embedding_dim,
+                "model": backend.model_name,
+            }
+        # Extracted content is kept even for documents whose embedding failed
+        writes.append(
+            (pending, _content_update_fields(content_replaced) + ["embedding", "has_embedding"])
+        )
+        logger.info("Computed embeddings for %d documents", embedded)
+
+    return results, writes
+
+
+def _save_document_embeddings(
+    writes: list[tuple[list[Document], list[str]]], document_ids: set[int] | None = None
+) -> None:
+    """Write prepared documents, one bulk_update per slice (only document_ids, if given)."""
+    for documents, fields in writes:
+        if document_ids is not None:
+            documents = [document for document in documents if document.pk in document_ids]
+        if documents:
+            with _merged_metadata(documents):
+                Document.objects.bulk_update(documents, fields)
+
+
+def _assign_cluster(document_id: int | None = None, document: Document | None = None) -> dict:
     """
     Assign a document to a cluster.
 
     Helper function that can be called directly (not a task).
+    Pass an already-loaded document to skip fetching it by id.
     """
-    try:
-        document = Document.objects.get(pk=document_id)
-    except Document.DoesNotExist:
-        logger.error("Document %s not found", document_id)
-        return {"status": "error", "message": "Document not found"}
+    if document is None:
+        try:
+            document = Document.objects.get(pk=document_id)
+        except Document.DoesNotExist:
+            logger.error("Document %s not found", document_id)
+            return {"status": "error", "message": "Document not found"}
+    document_id = document.pk
 
     try:
         cluster = assign_document_to_cluster(document)
@@ -127,60 +472,130 @@ def _assign_cluster(document_id: int) -> dict:
         return {"status": "error", "message": str(e)}
 
 
-def _score_document(document_id: int) -> dict:
+def _compute_scores(document: Document) -> dict[str, float]:
     """
-    Compute all scores for a document and store in first-class fields.
+    Compute all scores for a document and set them on the instance (not saved).
 
-    Helper function that can be called directly (not a task).
+    Returns {field name: score} for alignment, velocity, novelty, and relevance.
     """
-    from django.utils import timezone
+    # Component scores first: relevance is computed from the stored alignment/velocity
+    document.alignment = compute_alignment_score(document)
+    document.velocity = compute_velocity_score(document)
+    document.novelty = compute_novelty_score(document)
+    document.relevance = compute_relevance_score(document)
+    return {
+        "alignment": document.alignment,
+        "velocity": document.velocity,
+        "novelty": document.novelty,
+        "relevance": document.relevance,
+    }
 
-    try:
-        document = (
-            Document.objects.select_related("workspace")
-            .prefetch_related("sources", "cluster_memberships")
-            .get(pk=document_id)
-        )
-    except Document.DoesNotExist:
-        logger.error("Document %s not found", document_id)
-        return {"status": "error", "message": "Document not found"}
 
-    try:
-        # Compute component scores
-        alignment = compute_alignment_score(document)
-        velocity = compute_velocity_score(document)
-        novelty = compute_novelty_score(document)
+def _assign_clusters_batch(document_ids: list[int]) -> dict[int, int | None]:
+    """
+    Assign a batch of documents (one workspace) to clusters, in document_ids order.
 
-        # Store component scores in first-class fields
-        document.alignment = alignment
-        document.velocity = velocity
-        document.novelty = novelty
+    Returns {document_id: cluster_id or None}.
+    """
+    documents = Document.objects.only("id", "workspace_id", "embedding").in_bulk(document_ids)
+    assignments = assign_documents_to_clusters_batch(
+        [documents[doc_id] for doc_id in document_ids if doc_id in documents]
+    )
 
-        # Compute combined relevance score
-        relevance = compute_relevance_score(document)
+    # Re-label each cluster that is no longer a singleton, once per batch
+    for cluster in {c.id: c for c in assignments.values() if c is not None}.values():
+        if cluster.size >= 2:
+            try:
+                task_label_cluster.enqueue(cluster_id=cluster.id)
+            except Exception as e:
+                logger.warning("Failed to enqueue label task for cluster %s: %s", cluster.id, e)
 
-        # Store relevance and timestamp
-        document.relevance = relevance
-        document.scored_at = timezone.now()
+    return {
+        doc_id: cluster.id if cluster is not None else None
+        for doc_id, cluster in assignments.items()
+    }
 
-        # Save all score fields
-        document.save(
-            update_fields=[
-                "alignment",
-                "velocity",
-                "novelty",
-                "relevance",
-                "scored_at",
-                "updated_at",
-            ]
-        )
 
-        scores = {
-            "alignment": alignment,
-            "velocity": velocity,
-            "novelty": novelty,
-            "relevance": relevance,
-        }
+def _load_documents_for_scoring(document_ids: list[int]) -> list[Document]:
+    """Load documents with just the columns and memberships score_documents_bulk reads."""
+    return list(
+        Document.objects.filter(pk__in=document_ids)
+        .only(*SCORE_INPUT_FIELDS)
+        .prefetch_related("cluster_memberships")
+    )
+
+
+def _prefetched_batches(load, batches: list, lookahead: int = 1):
+    """
+    Yield (batch, load(batch)) for each batch, loading up to lookahead batches ahead
+    in a background thread so database reads overlap with the caller's work.
+
+    A load that raises yields the exception instead. Inside a transaction the loads
+    run inline, since another connection could not see the transaction's writes.
+    """
+    if connection.in_atomic_block:
+        for batch in batches:
+            try:
+                yield batch, load(batch)
+            except Exception as e:
+                yield batch, e
+        return
+
+    def load_safe(batch):
+        try:
+            return load(batch)
+        except Exception as e:
+            return e
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending = deque(pool.submit(load_safe, batch) for batch in batches[: lookahead + 1])
+        for index, batch in enumerate(batches):
+            result = pending.popleft().result()
+            if index + lookahead + 1 < len(batches):
+                pending.append(pool.submit(load_safe, batches[index + lookahead + 1]))
+            yield batch, result
+    finally:
+        for future in pending:
+            future.cancel()
+        # The loader thread has its own database connection; close it with the thread
+        pool.submit(connection.close)
+        pool.shutdown(wait=True)
+
+
+def _score_document(
+    document_id: int | None = None, document: Document | None = None, save: bool = True
+) -> dict:
+    """
+    Compute all scores for a document and store in first-class fields.
+
+    Helper function that can be called directly (not a task).
+    Pass an already-loaded document to skip fetching it by id. With save=False the
+    scores are only set on the instance, for the caller to save with its own write.
+    """
+    from django.utils import timezone
+
+    if document is None:
+        try:
+            # Only the columns the scorers read; of the workspace, just its core centroid
+            document = (
+                Document.objects.select_related("workspace")
+                .only(*SCORE_INPUT_FIELDS, "workspace__core_centroid")
+                .prefetch_related("sources", "cluster_memberships")
+                .get(pk=document_id)
+            )
+        except Document.DoesNotExist:
+            logger.error("Document %s not found", document_id)
+            return {"status": "error", "message": "Document not found"}
+    document_id = document.pk
+
+    try:
+        scores = _compute_scores(document)
+        document.scored_at = timezone.now()
+        if save:
+            # Savepoint when called inside a transaction, so a failed write rolls back alone
+            with transaction.atomic():
+                document.save(update_fields=[*scores, "scored_at", "updated_at"])
 
         logger.debug("Computed scores for document %s: %s", document_id, scores)
         return {"status": "success", "scores": scores}
@@ -194,35 +609,54 @@ def _process_document_sync(document_id: int) -> dict:
     Synchronous version of document processing pipeline.
 
     Helper function that can be called directly (not a task).
-    Used internally by task_process_workspace.
+    Used internally by task_process_document.
     """
+    # Fetch once and hand the same instance to every stage. Memberships are not
+    # prefetched: clustering adds one before scoring reads it.
     try:
-        Document.objects.select_related("workspace").get(pk=document_id)
+        document = (
+            Document.objects.select_related("workspace")
+            .prefetch_related("sources")
+            .get(pk=document_id)
+        )
     except Document.DoesNotExist:
         logger.error("Document %s not found", document_id)
         return {"status": "error", "message": "Document not found"}
 
     results = {}
+    # Embedding and scores are set on the instance and written with one save
+    original_content = document.content
 
     # Step 1: Extract and embed
-    embed_result = _extract_and_embed_document(document_id=document_id)
+    embed_result = _extract_and_embed_document(document=document, save=False)
     results["embedding"] = embed_result
+    update_fields = _content_update_fields(document.content != original_content)
     if embed_result.get("status") != "success":
+        with _merged_metadata([document]):
+            document.save(update_fields=update_fields)
         return {"status": "error", "step": "embedding", "results": results}
+    update_fields += ["embedding", "has_embedding"]
 
-    # Step 2: Assign to cluster
-    cluster_result = _assign_cluster(document_id=document_id)
-    results["clustering"] = cluster_result
+    # Steps 2 and 3 commit together with the document write
+    with transaction.atomic():
+        # Step 2: Assign to cluster
+        cluster_result = _assign_cluster(document=document)
+        results["clustering"] = cluster_result
 
-    # Step 3: Score
-    score_result = _score_document(document_id=document_id)
-    results["scoring"] = score_result
+        # Step 3: Score
+        score_result = _score_document(document=document, save=False)
+        results["scoring"] = score_result
+        if score_result.get("status") == "success":
+            update_fields += [*score_result["scores"], "scored_at"]
+
+        with _merged_metadata([document]):
+            document.save(update_fields=update_fields)
 
     logger.info("Processed document %s: %s", document_id, results)
     return {"status": "success", "results": results}
 
 
-@task
+@task(queue_name=IO_QUEUE)
 def task_ingest_workspace(workspace_id: int) -> dict[str, int]:
     """Ingest documents from all healthy sources in a workspace."""
     try:
@@ -233,25 +667,46 @@ def task_ingest_workspace(workspace_id: int) -> dict[str, int]:
     return ingest_workspace(workspace)
 
 
-@task
-def task_ingest_source(source_id: int) -> tuple[int, int]:
-    """Ingest documents from a single source."""
+@task(queue_name=IO_QUEUE)
+def task_ingest_source(source_id: int, attempt: int = 0) -> tuple[int, int]:
+    """
+    Ingest documents from a single source, retrying later on transient network errors.
+
+    Retries stop once the source is paused (its consecutive failures reached
+    auto_pause_threshold), so a dead endpoint isn't fetched again until resumed.
+    """
     try:
         source = Source.objects.select_related("workspace").get(pk=source_id)
     except Source.DoesNotExist:
         logger.error("Source %s not found", source_id)
         return (0, 0)
-    return ingest_source(source)
+    if attempt and source.status == "paused":
+        logger.info("Source %s is paused; dropping retry %d", source.name, attempt)
+        return (0, 0)
+    try:
+        return ingest_source(source)
+    except RETRYABLE_ERRORS:
+        if source.status != "paused" and _retry_later(
+            task_ingest_source, attempt, source_id=source_id
+        ):
+            return (0, 0)
+        raise
 
 
-@task
-def task_extract_and_embed_document(document_id: int) -> dict:
+@task(queue_name=IO_QUEUE)
+def task_extract_and_embed_document(document_id: int, attempt: int = 0) -> dict:
     """
     Extract clean content and compute embedding for a document.
 
-    Returns dict with status and embedding metadata.
+    Returns dict with status and embedding metadata. Transient embedding API
+    failures are retried later with backoff.
     """
-    return _extract_and_embed_document(document_id)
+    result = _extract_and_embed_document(document_id)
+    if result.get("retryable"):
+        result["retrying"] = _retry_later(
+            task_extract_and_embed_document, attempt, document_id=document_id
+        )
+    return result
 
 
 @task
@@ -280,10 +735,27 @@ def task_update_workspace_core(workspace_id: int) -> dict:
         if not workspace.core_centroid or not workspace.core_centroid.get("vector"):
             logger.info("Seeding workspace %s core", workspace_id)
             seed_workspace_core(workspace)
+            previous = None
+        else:
+            previous = workspace.core_centroid.get("vector")
 
         # Update centroid from feedback
         centroid = update_workspace_core_centroid(workspace)
         if centroid:
+            if previous and 1.0 - cosine_similarity(previous, centroid) < CORE_RESCORE_EPSILON:
+                # Alignment is unchanged, so only relevance of voted documents (whose
+                # feedback bias may have changed) needs updating
+                voted = WorkspaceCoreFeedback.objects.filter(workspace=workspace).values(
+                    "document_id"
+                )
+                update_relevance_scores(workspace.documents.filter(pk__in=voted), workspace)
+                logger.info("Core for workspace %s barely moved; skipping rescore", workspace_id)
+                return {
+                    "status": "success",
+                    "centroid_dim": len(centroid),
+                    "skipped_rescore": True,
+                }
+
             # Trigger rescore of workspace documents (alignment depends on core)
             task_rescore_workspace.enqueue(workspace_id=workspace_id)
             return {"status": "success", "centroid_dim": len(centroid)}
@@ -294,14 +766,89 @@ def task_update_workspace_core(workspace_id: int) -> dict:
         return {"status": "error", "message": str(e)}
 
 
-@task
-def task_process_document(document_id: int) -> dict:
+@task(queue_name=IO_QUEUE)
+def task_process_document(document_id: int, attempt: int = 0) -> dict:
     """
     Full processing pipeline for a document: extract → embed → cluster → score.
 
-    This is the main entry point for processing newly ingested documents.
+    This is the main entry point for processing newly ingested documents. A
+    transient embedding API failure retries the pipeline later with backoff.
+    """
+    result = _process_document_sync(document_id=document_id)
+    if result.get("results", {}).get("embedding", {}).get("retryable"):
+        result["retrying"] = _retry_later(task_process_document, attempt, document_id=document_id)
+    return result
+
+
+@task(queue_name=IO_QUEUE)
+def task_process_documents(workspace_id: int, document_ids: list[int], attempt: int = 0) -> dict:
     """
-    return _process_document_sync(document_id=document_id)
+    Process a batch of documents: embed, cluster, and score each step as a batch.
+
+    Enqueued by task_process_workspace, one task per batch, so batches run in
+    parallel across workers. Documents that are already embedded, or that another
+    worker embeds or locks while this batch is fetching, are skipped. Documents
+    whose embedding failed transiently are retried later, with backoff, as a new
+    batch.
+    """
+    try:
+        workspace = Workspace.objects.get(pk=workspace_id)
+    except Workspace.DoesNotExist:
+        logger.error("Workspace %s not found", workspace_id)
+        return {"status": "error", "message": "Workspace not found"}
+
+    try:
+        # Page and link fetches, summaries, and the embedding API run outside any
+        # transaction, so no database lock is held while they wait on the network
+        pending_ids = list(
+            Document.objects.filter(pk__in=document_ids, has_embedding=False).values_list(
+                "id", flat=True
+            )
+        )
+        embed_results, writes = _prepare_document_embeddings(pending_ids)
+
+        # One short transaction (one commit) for the batch's writes; clustering and
+        # scoring run in savepoints so a failure in either keeps the embeddings
+        with transaction.atomic():
+            # Re-check the claim now: rows another worker embedded (or, off SQLite,
+            # holds locked) while this batch was on the network are skipped
+            claimed = set(
+                Document.objects.filter(pk__in=pending_ids, has_embedding=False)
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)
+            )
+            claimed_ids = [doc_id for doc_id in pending_ids if doc_id in claimed]
+            _save_document_embeddings(writes, claimed)
+            embedded_ids = [
+                doc_id for doc_id in claimed_ids if embed_results[doc_id].get("status") == "success"
+            ]
+
+            try:
+                with transaction.atomic():
+                    _assign_clusters_batch(embedded_ids)
+            except Exception as e:
+                logger.exception("Error clustering documents in workspace %s: %s", workspace_id, e)
+            try:
+                with transaction.atomic():
+                    score_documents_bulk(Document.objects.filter(pk__in=embedded_ids), workspace)
+            except Exception as e:
+                logger.exception("Error scoring documents in workspace %s: %s", workspace_id, e)
+    except Exception as e:
+        logger.exception("Error processing documents in workspace %s: %s", workspace_id, e)
+        return {"status": "error", "processed": 0, "errors": len(document_ids)}
+
+    retry_ids = [doc_id for doc_id in claimed_ids if embed_results[doc_id].get("retryable")]
+    retrying = bool(retry_ids) and _retry_later(
+        task_process_documents, attempt, workspace_id=workspace_id, document_ids=retry_ids
+    )
+
+    return {
+        "status": "success",
+        "processed": len(embedded_ids),
+        "skipped": len(document_ids) - len(claimed_ids),
+        "errors": len(claimed_ids) - len(embedded_ids),
+        "retrying": len(retry_ids) if retrying else 0,
+    }
 
 
 @task
@@ -309,7 +856,8 @@ def task_process_workspace(workspace_id: int) -> dict:
     """
     Batch process all documents in a workspace (backfill embeddings/scores).
 
-    Processes documents that don't have embeddings yet.
+    Enqueues a task_process_documents task per EMBED_BATCH_SIZE documents that don't
+    have embeddings yet, so the worker pool processes batches concurrently.
     """
     try:
         workspace = Workspace.objects.get(pk=workspace_id)
@@ -317,35 +865,36 @@ def task_process_workspace(workspace_id: int) -> dict:
         logger.error("Workspace %s not found", workspace_id)
         return {"status": "error", "message": "Workspace not found"}
 
-    # Find documents without embeddings
-    documents = workspace.documents.filter(embedding=[])
-    total = documents.count()
+    # Page through documents without embeddings by id, one batch at a time, so the
+    # ID list is never held in memory (keyset paging stays correct if a batch is
+    # processed, and its rows updated, before the next page is read)
+    pending = (
+        workspace.documents.filter(has_embedding=False).order_by("id").values_list("id", flat=True)
+    )
 
-    processed = 0
+    total = 0
+    batches = 0
     errors = 0
-
-    for doc in documents:
+    last_id = 0
+    while batch_ids := list(pending.filter(id__gt=last_id)[:EMBED_BATCH_SIZE]):
+        total += len(batch_ids)
+        last_id = batch_ids[-1]
         try:
-            # Call the helper function directly for synchronous execution
-            # We can't call task_process_document directly since it's a Task object
-            # Instead, we'll call the underlying logic
-            result = _process_document_sync(document_id=doc.id)
-            if result.get("status") == "success":
-                processed += 1
-            else:
-                errors += 1
+            task_process_documents.enqueue(workspace_id=workspace_id, document_ids=batch_ids)
+            batches += 1
         except Exception as e:
-            logger.exception("Error processing document %s: %s", doc.id, e)
-            errors += 1
+            logger.warning(
+                "Failed to enqueue processing batch for workspace %s: %s", workspace_id, e
+            )
+            errors += len(batch_ids)
 
     logger.info(
-        "Processed workspace %s: %d/%d documents processed, %d errors",
+        "Enqueued processing for workspace %s: %d documents in %d batches",
         workspace_id,
-        processed,
         total,
-        errors,
+        batches,
     )
-    return {"status": "success", "processed": processed, "total": total, "errors": errors}
+    return {"status": "enqueued", "total": total, "batches": batches, "errors": errors}
 
 
 @task
@@ -392,16 +941,13 @@ def task_update_cluster_metrics(workspace_id: int = None, cluster_id: int = None
         logger.error("Cluster %s not found", cluster_id)
         return {"status": "error", "message": "Cluster not found"}
 
-    updated_count = 0
-    errors = 0
-
-    for cluster in clusters:
-        try:
-            update_cluster_metrics(cluster)
-            updated_count += 1
-        except Exception as e:
-            logger.exception("Failed to update metrics for cluster %s: %s", cluster.id, e)
-            errors += 1
+    try:
+        total = clusters.count()
+        updated_count = len(update_cluster_metrics_bulk(clusters))
+    except Exception as e:
+        logger.exception("Failed to update cluster metrics: %s", e)
+        return {"status": "error", "message": str(e)}
+    errors = total - updated_count
 
     logger.info("Updated metrics for %d clusters (%d errors)", updated_count, errors)
     return {
@@ -463,7 +1009,7 @@ def task_rescore_workspace(workspace_id: int, scope: str = "all") -> dict:
         return {"status": "error", "message": "Workspace not found"}
 
     # Get documents with embeddings
-    documents = workspace.documents.exclude(embedding=[]).filter(embedding__isnull=False)
+    documents = workspace.documents.filter(has_embedding=True)
     if scope == "recent":
         from datetime import timedelta
 
@@ -472,20 +1018,26 @@ def task_rescore_workspace(workspace_id: int, scope: str = "all") -> dict:
         cutoff = timezone.now() - timedelta(days=7)
         documents = documents.filter(updated_at__gte=cutoff)
 
-    total = documents.count()
+    # Score in batches: a few queries and matrix products per batch instead of
+    # a full fetch/score/save round trip per document
+    document_ids = list(documents.values_list("id", flat=True))
+    total = len(document_ids)
     rescored = 0
     errors = 0
 
-    for doc in documents:
+    batches = [
+        document_ids[start : start + SCORE_BATCH_SIZE]
+        for start in range(0, len(document_ids), SCORE_BATCH_SIZE)
+    ]
+    # The next batch is loaded in the background while this one is scored
+    for batch_ids, batch in _prefetched_batches(_load_documents_for_scoring, batches):
         try:
-            result = _score_document(document_id=doc.id)
-            if result.get("status") == "success":
-                rescored += 1
-            else:
-                errors += 1
+            if isinstance(batch, Exception):
+                raise batch
+            rescored += score_documents_bulk(batch, workspace)
         except Exception as e:
-            logger.exception("Error rescoring document %s: %s", doc.id, e)
-            errors += 1
+            logger.exception("Error rescoring documents in workspace %s: %s", workspace_id, e)
+            errors += len(batch_ids)
 
     logger.info(
         "Rescored workspace %s: %d/%d documents rescored, %d errors",
@@ -515,33 +1067,62 @@ def task_recompute_novelty(workspace_id: int) -> dict:
 
     from django.utils import timezone
 
-    # Get documents with embeddings
-    documents = (
-        workspace.documents.exclude(embedding=[])
-        .filter(embedding__isnull=False)
-        .prefetch_related("cluster_memberships")
+    # Page (id, embedding) rows by id rather than loading Document instances, so memory
+    # stays bounded by the page and no model objects are built just to read a vector.
+    # Each page is fully read before its writes, so no cursor over documents is open
+    # while they are updated (SQLite gives no isolation within one connection).
+    rows = (
+        workspace.documents.filter(has_embedding=True).order_by("id").values_list("id", "embedding")
     )
 
-    total = documents.count()
+    total = 0
     recomputed = 0
     errors = 0
+    now = timezone.now()
+
+    def recompute(chunk):
+        ids = [doc_id for doc_id, _ in chunk]
+        # Each document's first membership, as compute_novelty_score uses (newest first,
+        # so the oldest overwrites)
+        assigned: dict[int, int] = {}
+        memberships = (
+            ClusterMembership.objects.filter(document_id__in=ids)
+            .order_by("-pk")
+            .values_list("document_id", "cluster_id")
+        )
+        for doc_id, cluster_id in memberships:
+            assigned[doc_id] = cluster_id
 
-    for doc in documents:
-        try:
-            novelty = compute_novelty_score(doc)
-            doc.novelty = novelty
-            doc.scored_at = timezone.now()
-            doc.save(update_fields=["novelty", "scored_at", "updated_at"])
-
-            # Also recompute relevance since novelty changed
-            relevance = compute_relevance_score(doc)
-            doc.relevance = relevance
-            doc.save(update_fields=["relevance", "updated_at"])
+        novelty = compute_novelty_scores_bulk(
+            [embedding for _, embedding in chunk],
+            [assigned.get(doc_id) for doc_id in ids],
+            workspace.id,
+        )
+        # bulk_update skips auto_now, so stamp updated_at alongside scored_at
+        Document.objects.bulk_update(
+            [
+                Document(pk=doc_id, novelty=float(score), scored_at=now, updated_at=now)
+                for doc_id, score in zip(ids, novelty, strict=True)
+            ],
+            ["novelty", "scored_at", "updated_at"],
+        )
+        # Also recompute relevance since novelty changed
+        update_relevance_scores(Document.objects.filter(pk__in=ids), workspace)
 
-            recomputed += 1
+    def flush(chunk):
+        nonlocal total, recomputed, errors
+        total += len(chunk)
+        try:
+            recompute(chunk)
+            recomputed += len(chunk)
         except Exception as e:
-            logger.exception("Error recomputing novelty for document %s: %s", doc.id, e)
-            errors += 1
+            logger.exception("Error recomputing novelty for %d documents: %s", len(chunk), e)
+            errors += len(chunk)
+
+    last_id = 0
+    while chunk := list(rows.filter(id__gt=last_id)[:RELEVANCE_UPDATE_CHUNK]):
+        last_id = chunk[-1][0]
+        flush(chunk)
 
     logger.info(
         "Recomputed novelty for workspace %s: %d/%d documents, %d errors",
@@ -553,7 +1134,7 @@ def task_recompute_novelty(workspace_id: int) -> dict:
     return {"status": "success", "recomputed": recomputed, "total": total, "errors": errors}
 
 
-@task
+@task(queue_name=IO_QUEUE)
 def task_reembed_workspace(workspace_id: int) -> dict:
     """
     Re-embed all documents in a workspace using the current embedding backend.
@@ -602,7 +1183,7 @@ def task_reembed_workspace(workspace_id: int) -> dict:
     return {"status": "success", "reembedded": reembedded, "total": total, "errors": errors}
 
 
-@task
+@task(queue_name=IO_QUEUE)
 def task_label_cluster(cluster_id: int) -> dict:
     """Generate and save a descriptive label for a cluster using an LLM."""
     try:
@@ -622,6 +1203,32 @@ def task_label_cluster(cluster_id: int) -> dict:
         return {"status": "error", "message": str(e)}
 
 
+def _delete_documents_raw(ids: list[int]) -> int:
+    """
+    Delete documents by ID with one set-based statement per related table.
+
+    Foreign keys are not declared ON DELETE CASCADE in the database, so rows that
+    reference the documents are cleared first (deleted, or nulled for SET_NULL
+    relations). The documents themselves go in a single raw DELETE, skipping the
+    deletion collector's per-batch SELECTs. Must run inside a transaction.
+
+    Returns:
+        Number of documents deleted
+    """
+    for relation in Document._meta.related_objects:
+        related = relation.related_model.objects.filter(**{f"{relation.field.name}__in": ids})
+        if relation.on_delete is models.SET_NULL:
+            related.update(**{relation.field.name: None})
+        else:
+            related.delete()
+
+    table = connection.ops.quote_name(Document._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", ids)
+        return cursor.rowcount
+
+
 def cleanup_old_documents(workspace_id: int, days_old: int = 90) -> int:
     """
     Clean up old documents from a workspace.
@@ -637,6 +1244,19 @@ def cleanup_old_documents(workspace_id: int, days_old: int = 90) -> int:
     from django.utils import timezone
 
     cutoff_date = timezone.now() - timezone.timedelta(days=days_old)
-    deleted_count, _ = workspace.documents.filter(published_at__lt=cutoff_date).delete()
+    old_documents = workspace.documents.filter(published_at__lt=cutoff_date).order_by("id")
+
+    deleted_count = 0
+    while True:
+        with transaction.atomic():
+            ids = list(old_documents.values_list("id", flat=True)[:CLEANUP_BATCH_SIZE])
+            if not ids:
+                break
+            deleted_count += _delete_documents_raw(ids)
+
+    # Cached embeddings are shared across workspaces and never referenced by documents,
+    # so age them out with the same cutoff rather than letting the table grow forever
+    prune_embedding_cache(cutoff_date)
+
     logger.info("Cleaned up %d old documents from workspace %s", deleted_count, workspace.name)
     return deleted_count
@@ -4,6 +4,8 @@ Shared test fixtures and sample data for canopyresearch tests.
 Provider response data used across provider and ingestion tests.
 """
 
+import json
+
 # Minimal RSS 2.0 feed with 2 items
 RSS_MINIMAL = b"""<?xml version="1.0" encoding="UTF-8"?>
 <rss version="2.0">
@@ -74,3 +76,8 @@ REDDIT_RESPONSE = {
         ]
     }
 }
+
+# Encoded response bodies, serialized once at import. Tests set mock responses'
+# .json() to json.loads(...) of these, so each test gets a fresh copy to mutate.
+ALGOLIA_CONTENT = json.dumps(ALGOLIA_RESPONSE).encode()
+REDDIT_CONTENT = json.dumps(REDDIT_RESPONSE).encode()
@@ -2,14 +2,19 @@
 Tests for clustering service.
 """
 
+import numpy as np
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
 
 from canopyresearch.models import Cluster, ClusterMembership, Document, Workspace
 from canopyresearch.services.clustering import (
     assign_document_to_cluster,
+    assign_documents_to_clusters_batch,
     compute_cluster_centroid,
     reconcile_cluster_centroids,
+    update_cluster_metrics,
+    update_cluster_metrics_bulk,
 )
 
 User = get_user_model()
@@ -18,11 +23,12 @@ User = get_user_model()
 class ClusteringServiceTest(TestCase):
     """Test clustering service."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.user = User.objects.create_user(username="testuser", password="testpass")
-        self.workspace = Workspace.objects.create(
-            name="Test Workspace", description="Test", owner=self.user
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once per class (no test logs in, so skip password hashing)."""
+        cls.user = User.objects.create_user(username="testuser", password=None)
+        cls.workspace = Workspace.objects.create(
+            name="Test Workspace", description="Test", owner=cls.user
         )
 
     def test_assign_document_to_cluster_new(self):
@@ -66,6 +72,78 @@ class ClusteringServiceTest(TestCase):
         self.assertEqual(assigned_cluster.id, cluster.id)
         self.assertEqual(cluster.memberships.count(), 2)
 
+    def test_assign_document_to_cluster_picks_nearest_of_many(self):
+        """Single assignment joins the nearest cluster and sees clusters it just created."""
+        far = Cluster.objects.create(workspace=self.workspace, centroid=[0.0, 1.0, 0.0], size=0)
+        near = Cluster.objects.create(workspace=self.workspace, centroid=[1.0, 0.1, 0.0], size=0)
+        Cluster.objects.create(workspace=self.workspace, centroid=[1.0, 0.0], size=0)
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                content="Content",
+                embedding=embedding,
+            )
+            for i, embedding in enumerate([[0.9, 0.0, 0.0], [0.0, 0.0, 1.0], [0.0, 0.1, 0.9]])
+        ]
+
+        self.assertEqual(assign_document_to_cluster(docs[0], threshold=0.7).id, near.id)
+        created = assign_document_to_cluster(docs[1], threshold=0.7)
+        self.assertNotIn(created.id, {far.id, near.id})
+        self.assertEqual(assign_document_to_cluster(docs[2], threshold=0.7).id, created.id)
+        near.refresh_from_db()
+        self.assertEqual(near.size, 1)
+
+    def test_assign_documents_to_clusters_batch(self):
+        """Test batch assignment joins existing clusters and reuses clusters created in-batch."""
+        existing = Cluster.objects.create(
+            workspace=self.workspace, centroid=[1.0, 0.0, 0.0], size=0
+        )
+        embeddings = [[0.9, 0.1, 0.0], [0.0, 1.0, 0.0], [0.0, 0.95, 0.1], [], [0.0, 0.0, 1.0]]
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                content="Content",
+                embedding=embedding,
+            )
+            for i, embedding in enumerate(embeddings)
+        ]
+
+        assignments = assign_documents_to_clusters_batch(docs, threshold=0.7)
+
+        self.assertEqual(assignments[docs[0].id].id, existing.id)
+        self.assertNotEqual(assignments[docs[1].id].id, existing.id)
+        self.assertEqual(assignments[docs[2].id].id, assignments[docs[1].id].id)
+        self.assertIsNone(assignments[docs[3].id])
+        self.assertNotIn(assignments[docs[4].id].id, {existing.id, assignments[docs[1].id].id})
+        existing.refresh_from_db()
+        self.assertEqual(existing.size, 1)
+        self.assertEqual(ClusterMembership.objects.filter(document__in=docs).count(), 4)
+
+    def test_assign_documents_to_clusters_batch_grows_candidates(self):
+        """Test clusters created past the initial candidate capacity can still be joined."""
+        dimension = 40
+        embeddings = [np.eye(dimension)[i].tolist() for i in range(dimension)]
+        # Near the 34th new cluster, which was appended after the matrix had grown twice
+        embeddings.append((np.eye(dimension)[33] + 0.1 * np.eye(dimension)[0]).tolist())
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                embedding=embedding,
+            )
+            for i, embedding in enumerate(embeddings)
+        ]
+
+        assignments = assign_documents_to_clusters_batch(docs, threshold=0.7)
+
+        self.assertEqual(len({assignments[doc.id].id for doc in docs[:dimension]}), dimension)
+        self.assertEqual(assignments[docs[-1].id].id, assignments[docs[33].id].id)
+
     def test_compute_cluster_centroid(self):
         """Test computing cluster centroid."""
         cluster = Cluster.objects.create(workspace=self.workspace, centroid=[], size=0)
@@ -88,8 +166,7 @@ class ClusteringServiceTest(TestCase):
 
         centroid = compute_cluster_centroid(cluster)
         self.assertIsNotNone(centroid)
-        self.assertEqual(len(centroid), 3)
-        self.assertAlmostEqual(centroid[0], 2.5, places=1)
+        np.testing.assert_allclose(centroid, [2.5, 3.5, 4.5], atol=1e-5)
 
     def test_reconcile_cluster_centroids(self):
         """Test reconciling cluster centroids."""
@@ -107,3 +184,77 @@ class ClusteringServiceTest(TestCase):
         cluster.refresh_from_db()
         self.assertEqual(cluster.size, 1)
         self.assertEqual(len(cluster.centroid), 384)
+
+    def test_reconcile_cluster_centroids_matches_compute_cluster_centroid(self):
+        """Reconciling in bulk matches compute_cluster_centroid and drops empty clusters."""
+        member_embeddings = [[[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], []], [[0.5, 0.0, 0.5]], []]
+        clusters = []
+        for i, embeddings in enumerate(member_embeddings):
+            cluster = Cluster.objects.create(workspace=self.workspace, centroid=[0.0] * 3)
+            for j, embedding in enumerate(embeddings):
+                doc = Document.objects.create(
+                    workspace=self.workspace,
+                    title=f"Doc {i}-{j}",
+                    url=f"http://example.com/{i}/{j}",
+                    embedding=embedding,
+                )
+                ClusterMembership.objects.create(document=doc, cluster=cluster)
+            clusters.append(cluster)
+        expected = [compute_cluster_centroid(cluster) for cluster in clusters[:2]]
+
+        reconcile_cluster_centroids(workspace=self.workspace)
+
+        for cluster, centroid, size in zip(clusters[:2], expected, [3, 1], strict=True):
+            cluster.refresh_from_db()
+            self.assertEqual(cluster.size, size)
+            np.testing.assert_allclose(cluster.centroid, centroid, atol=1e-5)
+        self.assertFalse(Cluster.objects.filter(pk=clusters[2].pk).exists())
+
+    def test_update_cluster_metrics_bulk_matches_single(self):
+        """Bulk metrics update stores the same values as update_cluster_metrics."""
+        self.workspace.core_centroid = {"vector": [1.0, 0.0, 0.0]}
+        self.workspace.save()
+        initial_centroids = [[0.0, 1.0, 0.0], [], [1.0, 0.0, 0.0]]
+        member_embeddings = [[[1.0, 1.0, 0.0], [1.0, 0.0, 1.0]], [[0.0, 0.0, 1.0]], []]
+        clusters = []
+        for i, (centroid, embeddings) in enumerate(
+            zip(initial_centroids, member_embeddings, strict=True)
+        ):
+            cluster = Cluster.objects.create(workspace=self.workspace, centroid=centroid)
+            for j, embedding in enumerate(embeddings):
+                doc = Document.objects.create(
+                    workspace=self.workspace,
+                    title=f"Doc {i}-{j}",
+                    url=f"http://example.com/{i}/{j}",
+                    embedding=embedding,
+                )
+                ClusterMembership.objects.create(document=doc, cluster=cluster)
+            clusters.append(cluster)
+
+        expected = {cluster.id: update_cluster_metrics(cluster) for cluster in clusters}
+        snapshots = {
+            cluster.id: (cluster.centroid, cluster.previous_centroid) for cluster in clusters
+        }
+        # Restore the original centroids so the bulk path sees the same starting state
+        for cluster, centroid in zip(clusters, initial_centroids, strict=True):
+            Cluster.objects.filter(pk=cluster.pk).update(centroid=centroid, previous_centroid=[])
+
+        before = timezone.now()
+        with self.assertNumQueries(3):
+            results = update_cluster_metrics_bulk(Cluster.objects.filter(workspace=self.workspace))
+
+        self.assertEqual(set(results), set(expected))
+        for cluster in Cluster.objects.filter(workspace=self.workspace):
+            for key, value in expected[cluster.id].items():
+                if value is None:
+                    self.assertIsNone(results[cluster.id][key])
+                    self.assertIsNone(getattr(cluster, key))
+                else:
+                    self.assertAlmostEqual(results[cluster.id][key], value, places=5)
+                    self.assertAlmostEqual(getattr(cluster, key), value, places=5)
+            self.assertEqual((cluster.centroid, cluster.previous_centroid), snapshots[cluster.id])
+            self.assertIsNotNone(cluster.metrics_updated_at)
+            # bulk_update skips auto_now, so updated_at is stamped explicitly
+            self.assertGreaterEqual(cluster.updated_at, before)
+            # Bumped once by update_cluster_metrics and once by the bulk path
+            self.assertEqual(cluster.centroid_version, 2)
@@ -4,6 +4,7 @@ Tests for workspace core centroid management.
 
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 
@@ -14,7 +15,12 @@ from canopyresearch.services.core import (
     seed_workspace_core,
     update_workspace_core_centroid,
 )
-from canopyresearch.services.utils import cosine_similarity
+from canopyresearch.services.utils import (
+    cached_float32,
+    cosine_similarity,
+    unit_cosine,
+    unit_float32,
+)
 
 User = get_user_model()
 
@@ -22,19 +28,19 @@ User = get_user_model()
 class CoreServiceTest(TestCase):
     """Test core centroid management."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.user = User.objects.create_user(username="testuser", password="testpass")
-        self.workspace = Workspace.objects.create(
-            name="Test Workspace", description="Test description", owner=self.user
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once per class (no test logs in, so skip password hashing)."""
+        cls.user = User.objects.create_user(username="testuser", password=None)
+        cls.workspace = Workspace.objects.create(
+            name="Test Workspace", description="Test description", owner=cls.user
         )
 
     def test_compute_centroid(self):
         """Test centroid computation."""
         embeddings = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]]
         centroid = compute_centroid(embeddings)
-        self.assertEqual(len(centroid), 3)
-        self.assertAlmostEqual(centroid[0], 4.0, places=1)
+        np.testing.assert_allclose(centroid, [4.0, 5.0, 6.0], atol=1e-5)
 
     def test_cosine_similarity(self):
         """Test cosine similarity computation."""
@@ -47,6 +53,37 @@ class CoreServiceTest(TestCase):
         similarity = cosine_similarity(vec1, vec3)
         self.assertAlmostEqual(similarity, 0.0, places=5)
 
+    def test_cosine_similarity_float32_bounded(self):
+        """Test float32 rounding never pushes similarity outside [-1, 1]."""
+        vec = [0.1 * i + 0.013 for i in range(384)]
+        self.assertLessEqual(cosine_similarity(vec, vec), 1.0)
+        self.assertAlmostEqual(cosine_similarity(vec, vec), 1.0, places=5)
+        self.assertGreaterEqual(cosine_similarity(vec, [-x for x in vec]), -1.0)
+
+    def test_cached_float32_reuses_array_until_vector_replaced(self):
+        """Test float32 conversion is memoized per object and invalidated on reassignment."""
+        doc = Document(workspace=self.workspace, title="T", url="https://x.com", content="c")
+        doc.embedding = [1.0, 0.0]
+        first = cached_float32(doc, "_embedding_f32", doc.embedding)
+        self.assertIs(cached_float32(doc, "_embedding_f32", doc.embedding), first)
+        self.assertAlmostEqual(cosine_similarity(first, [1.0, 0.0]), 1.0, places=5)
+
+        doc.embedding = [0.0, 1.0]
+        second = cached_float32(doc, "_embedding_f32", doc.embedding)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.tolist(), [0.0, 1.0])
+
+    def test_unit_cosine_matches_cosine_similarity(self):
+        """Test dot product of unit vectors equals cosine; zero and mismatched give 0."""
+        vec1, vec2 = [3.0, 4.0, 0.0], [1.0, 2.0, 2.0]
+        self.assertAlmostEqual(
+            unit_cosine(unit_float32(vec1), unit_float32(vec2)),
+            cosine_similarity(vec1, vec2),
+            places=6,
+        )
+        self.assertEqual(unit_cosine(unit_float32([0.0, 0.0]), unit_float32([1.0, 0.0])), 0.0)
+        self.assertEqual(unit_cosine(unit_float32([1.0]), unit_float32([1.0, 0.0])), 0.0)
+
     def test_update_workspace_core_centroid_no_documents(self):
         """Test updating centroid with no documents."""
         centroid = update_workspace_core_centroid(self.workspace)
@@ -80,15 +117,20 @@ class CoreServiceTest(TestCase):
     @patch("canopyresearch.services.embeddings.get_embedding_backend")
     def test_seed_workspace_core(self, mock_get_backend):
         """Test seeding workspace core."""
-        # Create documents with embeddings
-        for i in range(10):
-            Document.objects.create(
-                workspace=self.workspace,
-                title=f"Doc {i}",
-                url=f"http://example.com/{i}",
-                content=f"Content {i}",
-                embedding=[float(i)] * 384,  # Mock embeddings
-            )
+        # Create documents with embeddings (bulk_create skips save(), so set has_embedding)
+        Document.objects.bulk_create(
+            [
+                Document(
+                    workspace=self.workspace,
+                    title=f"Doc {i}",
+                    url=f"http://example.com/{i}",
+                    content=f"Content {i}",
+                    embedding=[float(i)] * 384,  # Mock embeddings
+                    has_embedding=True,
+                )
+                for i in range(10)
+            ]
+        )
 
         # Mock embedding backend
         mock_backend = MagicMock()
@@ -7,7 +7,12 @@ from unittest.mock import MagicMock, patch
 
 from django.test import TestCase
 
-from canopyresearch.services.embeddings import OpenAIEmbeddingBackend, get_embedding_backend
+from canopyresearch.models import EmbeddingCache
+from canopyresearch.services.embeddings import (
+    OpenAIEmbeddingBackend,
+    embed_texts_cached,
+    get_embedding_backend,
+)
 
 
 class EmbeddingBackendTest(TestCase):
@@ -99,8 +104,61 @@ class EmbeddingBackendTest(TestCase):
         self.assertIsInstance(backend, OpenAIEmbeddingBackend)
         self.assertEqual(backend.model_name, "nomic-embed-text")
 
+    def test_get_embedding_backend_is_shared_per_configuration(self):
+        """Repeated calls reuse one backend (and its client) until the config changes."""
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test", "EMBEDDING_MODEL": "model-a"}):
+            backend = get_embedding_backend()
+            self.assertIs(get_embedding_backend(), backend)
+            with patch("openai.OpenAI") as mock_cls:
+                mock_cls.return_value.embeddings.create.return_value = self._mock_response([[0.1]])
+                backend.embed_texts(["one"])
+                backend.embed_texts(["two"])
+            mock_cls.assert_called_once()
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test", "EMBEDDING_MODEL": "model-b"}):
+            self.assertIsNot(get_embedding_backend(), backend)
+
     def test_get_embedding_backend_raises_without_key(self):
         with patch.dict(os.environ, {}, clear=False):
             os.environ.pop("OPENAI_API_KEY", None)
             with self.assertRaises(RuntimeError):
                 get_embedding_backend()
+
+
+class EmbedTextsCachedTest(TestCase):
+    """Test the content-hash embedding cache."""
+
+    def _make_backend(self, model="test-model", api_base="http://localhost:11434/v1"):
+        backend = MagicMock()
+        backend.model_name = model
+        backend.api_base = api_base
+        backend.embed_texts.side_effect = lambda texts: [[float(len(t)), 1.0] for t in texts]
+        return backend
+
+    def test_only_uncached_texts_reach_backend(self):
+        """Cached texts are served from EmbeddingCache; duplicates are embedded once."""
+        backend = self._make_backend()
+        first = embed_texts_cached(backend, ["alpha", "beta"])
+        self.assertEqual(first, [[5.0, 1.0], [4.0, 1.0]])
+        self.assertEqual(EmbeddingCache.objects.count(), 2)
+
+        backend.embed_texts.reset_mock()
+        second = embed_texts_cached(backend, ["beta", "gamma!", "gamma!", "alpha"])
+        self.assertEqual(second, [[4.0, 1.0], [6.0, 1.0], [6.0, 1.0], [5.0, 1.0]])
+        backend.embed_texts.assert_called_once_with(["gamma!"])
+
+    def test_cache_is_per_model(self):
+        """The same text under another model name is embedded again."""
+        embed_texts_cached(self._make_backend("model-a"), ["alpha"])
+        other = self._make_backend("model-b")
+        embed_texts_cached(other, ["alpha"])
+        other.embed_texts.assert_called_once_with(["alpha"])
+        self.assertEqual(EmbeddingCache.objects.count(), 2)
+
+    def test_cache_is_per_server(self):
+        """The same model name served from another API base is embedded again."""
+        embed_texts_cached(self._make_backend("nomic-embed-text"), ["alpha"])
+        other = self._make_backend("nomic-embed-text", api_base="http://vllm:8000/v1")
+        embed_texts_cached(other, ["alpha"])
+        other.embed_texts.assert_called_once_with(["alpha"])
+        self.assertEqual(EmbeddingCache.objects.count(), 2)
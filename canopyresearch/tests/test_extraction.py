@@ -19,6 +19,12 @@ class ExtractionServiceTest(TestCase):
         # Leading/trailing whitespace
         self.assertEqual(normalize_text("  hello  "), "hello")
 
+    def test_normalize_text_long_input(self):
+        """Whitespace is normalized the same way throughout a long document."""
+        text = "Para  one\t\there. \n\n\n\n  Para two.  " * 500
+        normalized = normalize_text(text)
+        self.assertEqual(normalized, ("Para one here.\n\nPara two. " * 500).strip())
+
     def test_clean_text(self):
         """Test text cleaning with length limit."""
         text = "This is a test " * 100  # Long text
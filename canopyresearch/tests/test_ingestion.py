@@ -5,21 +5,24 @@ Tests for canopyresearch ingestion service.
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.utils import timezone
 
-from canopyresearch.models import Document, DocumentSource, Source, Workspace
+from canopyresearch.models import Document, DocumentSource, IngestionLog, Source, Workspace
 from canopyresearch.services.ingestion import (
+    SOURCE_STATUS_FIELDS,
     compute_hash,
     ingest_source,
+    ingest_workspace,
     mark_source_error,
     persist_document,
+    persist_documents,
 )
 
 User = get_user_model()
 
 
-class ComputeHashTest(TestCase):
+class ComputeHashTest(SimpleTestCase):
     """Test compute_hash function."""
 
     def test_deterministic(self):
@@ -57,12 +60,13 @@ class ComputeHashTest(TestCase):
 class PersistDocumentTest(TestCase):
     """Test persist_document function."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user = User.objects.create_user(username="testuser", password="testpass")
-        self.workspace = Workspace.objects.create(name="Test Workspace", owner=self.user)
-        self.source = Source.objects.create(
-            workspace=self.workspace,
+        cls.user = User.objects.create_user(username="testuser", password=None)
+        cls.workspace = Workspace.objects.create(name="Test Workspace", owner=cls.user)
+        cls.source = Source.objects.create(
+            workspace=cls.workspace,
             name="Test Source",
             provider_type="rss",
         )
@@ -119,6 +123,28 @@ class PersistDocumentTest(TestCase):
         doc = Document.objects.get(workspace=self.workspace)
         self.assertEqual(doc.sources.count(), 2)
 
+    def test_persist_documents_batch_matches_sequential_dedup(self):
+        """Batch persist dedupes against existing rows and within the batch."""
+        existing = {"title": "Old", "url": "https://example.com/old", "content": "Old"}
+        persist_document(self.workspace, self.source, existing)
+        batch = [
+            {"title": "Old again", "url": "https://example.com/old", "content": "Changed"},
+            {"title": "New", "url": "https://example.com/new", "content": "New"},
+            {"title": "New", "url": "https://example.com/new", "content": "New"},
+            {"title": "Invalid", "url": "", "content": "No URL"},
+            {"title": "Other", "url": "https://example.com/other", "content": "Other"},
+        ]
+
+        created = persist_documents(self.workspace, self.source, batch)
+
+        self.assertEqual(created, 2)
+        urls = set(Document.objects.filter(workspace=self.workspace).values_list("url", flat=True))
+        self.assertEqual(
+            urls,
+            {"https://example.com/old", "https://example.com/new", "https://example.com/other"},
+        )
+        self.assertEqual(DocumentSource.objects.filter(source=self.source).count(), 3)
+
     def test_rejects_empty_url(self):
         """Persist raises ValueError for empty URL."""
         data = {
@@ -175,12 +201,13 @@ class PersistDocumentTest(TestCase):
 class MarkSourceErrorTest(TestCase):
     """Test mark_source_error function."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user = User.objects.create_user(username="testuser", password="testpass")
-        self.workspace = Workspace.objects.create(name="Test Workspace", owner=self.user)
-        self.source = Source.objects.create(
-            workspace=self.workspace,
+        cls.user = User.objects.create_user(username="testuser", password=None)
+        cls.workspace = Workspace.objects.create(name="Test Workspace", owner=cls.user)
+        cls.source = Source.objects.create(
+            workspace=cls.workspace,
             name="Test",
             provider_type="rss",
             status="healthy",
@@ -209,12 +236,13 @@ class MarkSourceErrorTest(TestCase):
 class IngestSourceTest(TestCase):
     """Test ingest_source function."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user = User.objects.create_user(username="testuser", password="testpass")
-        self.workspace = Workspace.objects.create(name="Test Workspace", owner=self.user)
-        self.source = Source.objects.create(
-            workspace=self.workspace,
+        cls.user = User.objects.create_user(username="testuser", password=None)
+        cls.workspace = Workspace.objects.create(name="Test Workspace", owner=cls.user)
+        cls.source = Source.objects.create(
+            workspace=cls.workspace,
             name="Test",
             provider_type="rss",
             status="healthy",
@@ -285,3 +313,98 @@ class IngestSourceTest(TestCase):
         self.assertFalse(
             Document.objects.filter(workspace=self.workspace, external_id="2").exists()
         )
+
+    def test_status_updates_deferred_to_caller(self):
+        """With status_updates, source status is set in memory and left for the caller."""
+        status_updates = []
+        with patch("canopyresearch.services.ingestion.get_provider_class") as mock_get:
+            mock_get.side_effect = RuntimeError("Provider broken")
+            with self.assertRaises(RuntimeError):
+                ingest_source(self.source, status_updates=status_updates)
+
+        self.assertEqual(status_updates, [self.source])
+        self.assertEqual(self.source.status, "error")
+        self.assertEqual(Source.objects.get(pk=self.source.pk).status, "healthy")
+
+        Source.objects.bulk_update(status_updates, SOURCE_STATUS_FIELDS)
+        self.source.refresh_from_db()
+        self.assertEqual(self.source.status, "error")
+        self.assertEqual(self.source.last_error, "Provider broken")
+
+
+class IngestWorkspaceTest(TestCase):
+    """Test ingest_workspace function."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.workspace = Workspace.objects.create(name="Test Workspace", owner=self.user)
+        self.good = Source.objects.create(
+            workspace=self.workspace, name="Good", provider_type="rss", status="healthy"
+        )
+        self.broken = Source.objects.create(
+            workspace=self.workspace, name="Broken", provider_type="rss", status="healthy"
+        )
+
+    def test_fetches_concurrently_and_records_each_outcome(self):
+        """Each source's fetch result is persisted and its status written."""
+        from unittest.mock import Mock
+
+        def make_provider(source):
+            provider = Mock()
+            if source.name == "Broken":
+                provider.fetch.side_effect = RuntimeError("Feed down")
+            else:
+                provider.fetch.return_value = [{"id": "1"}]
+                provider.normalize.return_value = {
+                    "external_id": "1",
+                    "title": "Article",
+                    "url": "https://example.com/1",
+                    "content": "Content",
+                    "published_at": timezone.now(),
+                }
+            return provider
+
+        with patch("canopyresearch.services.ingestion.get_provider_class") as mock_get:
+            mock_get.return_value = Mock(side_effect=make_provider)
+            stats = ingest_workspace(self.workspace)
+
+        self.assertEqual(stats["sources_processed"], 1)
+        self.assertEqual(stats["documents_saved"], 1)
+        self.assertEqual(stats["errors"], 1)
+        self.good.refresh_from_db()
+        self.broken.refresh_from_db()
+        self.assertIsNotNone(self.good.last_successful_fetch)
+        self.assertEqual(self.broken.status, "error")
+        self.assertEqual(self.broken.last_error, "Feed down")
+        self.assertFalse(IngestionLog.objects.filter(finished_at__isnull=True).exists())
+
+    def test_failed_persist_keeps_previous_validators(self):
+        """A source whose documents fail to persist keeps its old ETag/Last-Modified."""
+        from unittest.mock import Mock
+
+        Source.objects.filter(pk=self.good.pk).update(status="paused")
+        self.broken.http_etag = '"old-etag"'
+        self.broken.save(update_fields=["http_etag"])
+
+        def make_provider(source):
+            provider = Mock()
+
+            def fetch():
+                source.http_etag = '"new-etag"'
+                source.http_last_modified = "Wed, 14 Oct 2026 00:00:00 GMT"
+                return [{"id": "1"}]
+
+            provider.fetch.side_effect = fetch
+            provider.normalize.side_effect = RuntimeError("Bad document")
+            return provider
+
+        with patch("canopyresearch.services.ingestion.get_provider_class") as mock_get:
+            mock_get.return_value = Mock(side_effect=make_provider)
+            stats = ingest_workspace(self.workspace)
+
+        self.assertEqual(stats["errors"], 1)
+        self.broken.refresh_from_db()
+        self.assertEqual(self.broken.status, "error")
+        self.assertEqual(self.broken.http_etag, '"old-etag"')
+        self.assertEqual(self.broken.http_last_modified, "")
@@ -11,7 +11,8 @@ User = get_user_model()
 class AutoLoginMiddlewareTest(TestCase):
     """Test AutoLoginMiddleware functionality."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data - ensure admin user exists for most tests."""
         # Create admin user for tests that need it
         User.objects.filter(username="admin").delete()
@@ -244,3 +244,21 @@ class DocumentModelTest(TestCase):
         DocumentSource.objects.create(document=document, source=self.source)
 
         self.assertEqual(str(document), "Test Document")
+
+    def test_has_embedding_tracks_embedding_on_save(self):
+        """Test has_embedding follows embedding, including partial saves."""
+        document = Document.objects.create(
+            workspace=self.workspace,
+            title="Test Document",
+            url="https://example.com/article",
+            content="Test content",
+        )
+        self.assertFalse(document.has_embedding)
+
+        document.embedding = [0.1, 0.2]
+        document.save(update_fields=["embedding", "updated_at"])
+        self.assertTrue(Document.objects.get(pk=document.pk).has_embedding)
+
+        document.embedding = []
+        document.save()
+        self.assertFalse(Document.objects.get(pk=document.pk).has_embedding)
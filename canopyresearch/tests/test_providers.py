@@ -2,6 +2,9 @@
 Tests for canopyresearch source providers.
 """
 
+import json
+from datetime import datetime
+from datetime import timezone as dt_tz
 from unittest.mock import MagicMock, patch
 
 import requests
@@ -16,11 +19,12 @@ from canopyresearch.services.providers import (
     RSSProvider,
     SubredditProvider,
     _extract_links_from_html,
+    _html_to_text,
     _is_url_allowed,
     extract_article_content,
     get_provider_class,
 )
-from canopyresearch.tests.fixtures import ALGOLIA_RESPONSE, REDDIT_RESPONSE, RSS_MINIMAL
+from canopyresearch.tests.fixtures import ALGOLIA_CONTENT, REDDIT_CONTENT, RSS_MINIMAL
 
 User = get_user_model()
 
@@ -89,6 +93,36 @@ class RSSProviderTest(TestCase):
         self.assertEqual(result[0]["title"], "Item 1")
         self.assertEqual(result[0]["link"], "https://example.com/1")
 
+    @patch("canopyresearch.services.providers.requests.get")
+    def test_rss_provider_fetch_stores_cache_validators(self, mock_get):
+        """Test a 200 response records ETag/Last-Modified on the source."""
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.content = RSS_MINIMAL
+        mock_resp.headers = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+        mock_get.return_value = mock_resp
+
+        RSSProvider(self.source).fetch()
+        self.assertEqual(self.source.http_etag, '"v1"')
+        self.assertEqual(self.source.http_last_modified, "Wed, 01 Jan 2025 00:00:00 GMT")
+
+    @patch("canopyresearch.services.providers.requests.get")
+    def test_rss_provider_fetch_not_modified_returns_empty(self, mock_get):
+        """Test cached validators are sent and a 304 skips parsing."""
+        self.source.http_etag = '"v1"'
+        self.source.http_last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+        mock_resp = MagicMock()
+        mock_resp.status_code = 304
+        mock_get.return_value = mock_resp
+
+        result = RSSProvider(self.source).fetch()
+        self.assertEqual(result, [])
+        headers = mock_get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Wed, 01 Jan 2025 00:00:00 GMT")
+        mock_resp.raise_for_status.assert_not_called()
+        self.assertEqual(self.source.http_etag, '"v1"')
+
     @patch("canopyresearch.services.providers.requests.get")
     def test_rss_provider_fetch_handles_404(self, mock_get):
         """Test RSSProvider.fetch handles 404."""
@@ -133,6 +167,17 @@ class RSSProviderTest(TestCase):
         out = provider.normalize(raw)
         self.assertIsNotNone(out["published_at"])
 
+    def test_rss_provider_normalize_parses_published_string(self):
+        """Test RSSProvider.normalize parses date strings feedparser left unparsed."""
+        provider = RSSProvider(self.source)
+        raw = {"id": "x", "title": "T", "link": "https://x.com", "summary": "S"}
+
+        out = provider.normalize({**raw, "published": "2025-01-02T03:04:05Z"})
+        self.assertEqual(out["published_at"], datetime(2025, 1, 2, 3, 4, 5, tzinfo=dt_tz.utc))
+
+        out = provider.normalize({**raw, "published": "Wed, 01 Jan 2025 10:00:00 +0200"})
+        self.assertEqual(out["published_at"], datetime(2025, 1, 1, 8, 0, tzinfo=dt_tz.utc))
+
     @patch("canopyresearch.services.providers.requests.get")
     def test_rss_extract_body_links_emits_link_docs(self, mock_get):
         """Test extract_body_links emits one doc per link, not newsletter entry."""
@@ -172,6 +217,24 @@ class RSSProviderTest(TestCase):
         self.assertEqual(len(links), 1)
         self.assertEqual(links[0][0], "https://good.com")
 
+    def test_extract_links_skips_same_domain_and_duplicates(self):
+        """Test same-domain links and repeated hrefs are skipped; path case is kept."""
+        html = (
+            '<a href="https://news.com/self">Self</a>'
+            '<a href="https://news.com?ref=1">Self query</a>'
+            '<a href="https://youtu.be/AbC">A</a>'
+            '<a href="https://youtu.be/AbC">A again</a>'
+            '<a href="https://youtu.be/abc">B</a>'
+        )
+        links = _extract_links_from_html(html, skip_same_domain="https://news.com/issue/1")
+        self.assertEqual(links, [("https://youtu.be/AbC", "A"), ("https://youtu.be/abc", "B")])
+
+    def test_extract_links_joins_nested_anchor_text(self):
+        """Test link text includes nested element text but not the anchor's tail."""
+        html = '<p><a href="https://x.com/a"><b>Bold</b> and <i>italic</i></a> trailing</p>'
+        links = _extract_links_from_html(html)
+        self.assertEqual(links, [("https://x.com/a", "Bold and italic")])
+
     @patch("canopyresearch.services.providers.requests.get")
     def test_rss_extract_body_links_respects_max_links_per_entry(self, mock_get):
         """Test extract_body_links respects max_links_per_entry."""
@@ -230,6 +293,24 @@ class RSSProviderTest(TestCase):
         self.assertIn("extracted_content", result[0])
         self.assertIn("Article body text", result[0]["extracted_content"])
 
+    @patch("canopyresearch.services.providers.extract_article_content")
+    @patch("canopyresearch.services.providers.requests.get")
+    def test_rss_fetch_full_article_matches_content_to_entries(self, mock_get, mock_extract):
+        """Concurrently extracted content is attached to the entry it was fetched for."""
+        mock_resp = MagicMock()
+        mock_resp.content = RSS_MINIMAL
+        mock_resp.raise_for_status = MagicMock()
+        mock_get.return_value = mock_resp
+        mock_extract.side_effect = lambda url: f"Body of {url}"
+
+        self.source.config = {"url": "https://example.com/feed.xml", "fetch_full_article": True}
+        provider = RSSProvider(self.source)
+        result = provider.fetch()
+
+        self.assertEqual(len(result), 2)
+        for raw in result:
+            self.assertEqual(raw["extracted_content"], f"Body of {raw['link']}")
+
     @patch("canopyresearch.services.providers.requests.get")
     def test_rss_fetch_returns_empty_when_no_url(self, mock_get):
         """Test fetch returns empty when config has no url."""
@@ -259,7 +340,7 @@ class HackerNewsProviderTest(TestCase):
     def test_hackernews_provider_fetch_returns_stories_from_algolia(self, mock_get):
         """Test HackerNewsProvider.fetch returns raw docs from Algolia."""
         mock_resp = MagicMock()
-        mock_resp.json.return_value = ALGOLIA_RESPONSE
+        mock_resp.json.return_value = json.loads(ALGOLIA_CONTENT)
         mock_resp.raise_for_status = MagicMock()
         mock_get.return_value = mock_resp
 
@@ -362,7 +443,7 @@ class SubredditProviderTest(TestCase):
     def test_subreddit_provider_fetch_returns_posts_without_oauth(self, mock_get):
         """Test fetch returns posts from Reddit JSON endpoint."""
         mock_resp = MagicMock()
-        mock_resp.json.return_value = REDDIT_RESPONSE
+        mock_resp.json.return_value = json.loads(REDDIT_CONTENT)
         mock_resp.raise_for_status = MagicMock()
         mock_get.return_value = mock_resp
 
@@ -456,7 +537,7 @@ class SubredditProviderTest(TestCase):
         mock_post.return_value = mock_token_resp
 
         mock_reddit_resp = MagicMock()
-        mock_reddit_resp.json.return_value = REDDIT_RESPONSE
+        mock_reddit_resp.json.return_value = json.loads(REDDIT_CONTENT)
         mock_reddit_resp.raise_for_status = MagicMock()
         mock_get.return_value = mock_reddit_resp
 
@@ -488,6 +569,18 @@ class SubredditProviderTest(TestCase):
         self.assertEqual(result, [])
         mock_get.assert_not_called()
 
+    @patch("canopyresearch.services.providers.requests.get")
+    def test_subreddit_search_returns_empty_on_malformed_json(self, mock_get):
+        """Test a non-JSON search response yields no posts rather than raising."""
+        mock_resp = MagicMock()
+        mock_resp.json.side_effect = ValueError("Expecting value")
+        mock_resp.raise_for_status = MagicMock()
+        mock_get.return_value = mock_resp
+
+        args = ("python", 10, "week", False, None, None, None)
+        self.assertEqual(SubredditProvider._search_subreddit("python", *args), [])
+        self.assertEqual(SubredditProvider._search_reddit_all(*args), [])
+
 
 class IsUrlAllowedTest(TestCase):
     """Test _is_url_allowed URL validation."""
@@ -531,6 +624,13 @@ class IsUrlAllowedTest(TestCase):
         """Test that hostnames containing IP segments are blocked."""
         self.assertFalse(_is_url_allowed("http://127.0.0.1.example.com"))
         self.assertFalse(_is_url_allowed("https://192.168.1.1.malicious.com"))
+        self.assertFalse(_is_url_allowed("http://cdn.10.0.0.1.nip.io"))
+
+    def test_allows_hostnames_with_non_ip_numeric_labels(self):
+        """Test numeric labels that don't form a whole dotted quad are allowed."""
+        self.assertTrue(_is_url_allowed("http://x1.2.3.4.example.com"))
+        self.assertTrue(_is_url_allowed("http://256.1.1.1.example.com"))
+        self.assertTrue(_is_url_allowed("http://01.2.3.4.example.com"))
 
     def test_blocks_invalid_urls(self):
         """Test that invalid URLs are blocked."""
@@ -601,6 +701,34 @@ class ExtractArticleContentTest(TestCase):
         result = extract_article_content("https://example.com/large")
         self.assertIsNone(result)
 
+    @patch("canopyresearch.services.providers.requests.get")
+    def test_extract_article_content_rejects_large_content_length(self, mock_get):
+        """Test an oversized Content-Length is rejected without reading the body."""
+        from canopyresearch.services.providers import MAX_RESPONSE_SIZE
+
+        mock_resp = MagicMock()
+        mock_resp.headers = {
+            "Content-Type": "text/html",
+            "Content-Length": str(MAX_RESPONSE_SIZE + 1),
+        }
+        mock_get.return_value = mock_resp
+
+        result = extract_article_content("https://example.com/large")
+        self.assertIsNone(result)
+        mock_resp.iter_content.assert_not_called()
+
+
+class HtmlToTextTest(TestCase):
+    """Test _html_to_text helper."""
+
+    def test_ignores_script_style_and_comments(self):
+        """Test script/style/noscript bodies and comments are not part of the text."""
+        html = (
+            "<div><p>Keep <b>this</b></p><script>var x = 1;</script>"
+            "<style>p {}</style><noscript>Enable JS</noscript><!-- note --> tail</div>"
+        )
+        self.assertEqual(_html_to_text(html), "Keep this tail")
+
 
 class ProviderRegistryTest(TestCase):
     """Test provider registry and resolver."""
@@ -4,17 +4,36 @@ Tests for scoring services.
 
 from datetime import timedelta
 
+import numpy as np
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.utils import timezone
 
-from canopyresearch.models import Cluster, Document, Workspace
+from canopyresearch.models import (
+    Cluster,
+    ClusterMembership,
+    Document,
+    DocumentSource,
+    Source,
+    Workspace,
+    WorkspaceCoreFeedback,
+)
+from canopyresearch.services.clustering import bump_centroid_version, update_cluster_metrics
 from canopyresearch.services.scoring import (
     compute_alignment_score,
     compute_cluster_velocity_score,
+    compute_feedback_bias_bulk,
     compute_novelty_score,
+    compute_novelty_scores_bulk,
+    compute_relevance_score,
+    compute_source_weight_bulk,
     compute_velocity_score,
+    compute_velocity_scores_bulk,
+    score_documents_bulk,
+    update_relevance_scores,
 )
+from canopyresearch.services.scoring.novelty import centroid_snapshot
+from canopyresearch.services.scoring.relevance import compute_feedback_bias, compute_source_weight
 
 User = get_user_model()
 
@@ -76,6 +95,226 @@ class ScoringServiceTest(TestCase):
         score = compute_novelty_score(doc)
         self.assertLess(score, 1.0)  # Less novel when similar to cluster
 
+    def test_compute_novelty_score_bounded_for_identical_centroid(self):
+        """Test novelty stays within [0, 1] when a centroid matches the document exactly."""
+        vector = [0.3, -0.7, 0.11, 0.05] * 96
+        Cluster.objects.create(workspace=self.workspace, centroid=vector, size=1)
+        doc = Document.objects.create(
+            workspace=self.workspace,
+            title="Test Doc",
+            url="http://example.com",
+            content="Test content",
+            embedding=vector,
+        )
+
+        score = compute_novelty_score(doc)
+        self.assertGreaterEqual(score, 0.0)
+        self.assertAlmostEqual(score, 0.0, places=5)
+
+    def test_compute_novelty_score_uses_nearest_unassigned_cluster(self):
+        """Test novelty takes the nearest cluster, ignoring the assigned and mismatched ones."""
+        own = Cluster.objects.create(workspace=self.workspace, centroid=[1.0, 0.0, 0.0], size=1)
+        Cluster.objects.create(workspace=self.workspace, centroid=[0.0, 1.0, 0.0], size=1)
+        Cluster.objects.create(workspace=self.workspace, centroid=[1.0, 1.0, 0.0], size=1)
+        Cluster.objects.create(workspace=self.workspace, centroid=[1.0, 0.0], size=1)
+
+        doc = Document.objects.create(
+            workspace=self.workspace,
+            title="Test Doc",
+            url="http://example.com",
+            content="Test content",
+            embedding=[1.0, 0.0, 0.0],
+        )
+        ClusterMembership.objects.create(document=doc, cluster=own)
+
+        score = compute_novelty_score(doc)
+        # Nearest other cluster is [1, 1, 0]: cosine = 1/sqrt(2)
+        self.assertAlmostEqual(score, 1.0 - 2**-0.5, places=5)
+
+        # With memberships prefetched and the centroid snapshot cached, only the
+        # snapshot version check is issued
+        doc = Document.objects.prefetch_related("cluster_memberships").get(pk=doc.pk)
+        with self.assertNumQueries(1):
+            self.assertAlmostEqual(compute_novelty_score(doc), 1.0 - 2**-0.5, places=5)
+
+    def test_centroid_snapshot_rebuilt_when_clusters_change(self):
+        """Test the cached centroid matrix is reused until a centroid is rewritten."""
+        cluster = Cluster.objects.create(workspace=self.workspace, centroid=[0.0, 1.0, 0.0], size=1)
+        doc = Document.objects.create(
+            workspace=self.workspace,
+            title="Test Doc",
+            url="http://example.com",
+            content="Test content",
+            embedding=[1.0, 0.0, 0.0],
+        )
+        self.assertAlmostEqual(compute_novelty_score(doc), 1.0, places=5)
+        snapshot = centroid_snapshot(self.workspace.id)
+        self.assertIs(centroid_snapshot(self.workspace.id), snapshot)
+
+        cluster.centroid = [1.0, 0.0, 0.0]
+        bump_centroid_version(cluster)
+        cluster.save(update_fields=["centroid", "centroid_version"])
+        self.assertAlmostEqual(compute_novelty_score(doc), 0.0, places=5)
+        snapshot = centroid_snapshot(self.workspace.id)
+
+        # A writer whose updated_at stamp is older than the last one still invalidates
+        cluster.centroid = [0.0, 0.0, 1.0]
+        cluster.updated_at = cluster.updated_at - timedelta(minutes=5)
+        bump_centroid_version(cluster)
+        Cluster.objects.bulk_update([cluster], ["centroid", "centroid_version", "updated_at"])
+        self.assertAlmostEqual(compute_novelty_score(doc), 1.0, places=5)
+        self.assertIsNot(centroid_snapshot(self.workspace.id), snapshot)
+
+    def test_centroid_snapshot_rebuilt_after_metrics_refresh(self):
+        """Test a centroid rewritten by update_cluster_metrics invalidates the snapshot."""
+        cluster = Cluster.objects.create(workspace=self.workspace, centroid=[1.0, 0.0], size=1)
+        member = Document.objects.create(
+            workspace=self.workspace,
+            title="Member",
+            url="http://example.com/member",
+            content="Test content",
+            embedding=[0.0, 1.0],
+        )
+        ClusterMembership.objects.create(document=member, cluster=cluster)
+        ids, matrix = centroid_snapshot(self.workspace.id)[2]
+        np.testing.assert_allclose(matrix, [[1.0, 0.0]])
+
+        update_cluster_metrics(cluster)
+
+        ids, matrix = centroid_snapshot(self.workspace.id)[2]
+        self.assertEqual(list(ids), [cluster.id])
+        np.testing.assert_allclose(matrix, [[0.0, 1.0]])
+
+    def test_score_documents_bulk_matches_per_document_scores(self):
+        """Test the fused batch scorer stores the same scores as the individual scorers."""
+        self.workspace.core_centroid = {"vector": [1.0, 0.5, 0.0]}
+        self.workspace.save()
+        own = Cluster.objects.create(workspace=self.workspace, centroid=[1.0, 0.0, 0.0], size=1)
+        Cluster.objects.create(workspace=self.workspace, centroid=[0.2, 1.0, 0.0], size=1)
+        now = timezone.now()
+        embeddings = [[1.0, 0.0, 0.0], [0.0, 1.0, 1.0], [-1.0, 0.2, 0.0], [1.0, 0.0]]
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                content="Content",
+                embedding=embedding,
+                published_at=now - timedelta(days=i),
+            )
+            for i, embedding in enumerate(embeddings)
+        ]
+        ClusterMembership.objects.create(document=docs[0], cluster=own)
+        WorkspaceCoreFeedback.objects.create(workspace=self.workspace, document=docs[1], vote="up")
+
+        self.assertEqual(score_documents_bulk(docs, self.workspace), len(docs))
+
+        for doc in docs:
+            doc.refresh_from_db()
+            self.assertAlmostEqual(doc.alignment, compute_alignment_score(doc), places=5)
+            self.assertAlmostEqual(doc.novelty, compute_novelty_score(doc), places=5)
+            self.assertAlmostEqual(doc.velocity, compute_velocity_score(doc), places=3)
+            self.assertAlmostEqual(
+                doc.relevance, compute_relevance_score(doc, self.workspace), places=5
+            )
+            self.assertIsNotNone(doc.scored_at)
+
+    def test_compute_novelty_scores_bulk_matches_per_document(self):
+        """Test bulk novelty from raw rows agrees with compute_novelty_score."""
+        own = Cluster.objects.create(workspace=self.workspace, centroid=[1.0, 0.0, 0.0], size=1)
+        Cluster.objects.create(workspace=self.workspace, centroid=[0.6, 0.8, 0.0], size=1)
+        embeddings = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 0.0], []]
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                embedding=embedding,
+            )
+            for i, embedding in enumerate(embeddings)
+        ]
+        ClusterMembership.objects.create(document=docs[0], cluster=own)
+
+        novelty = compute_novelty_scores_bulk(
+            embeddings, [own.id, None, None, None], self.workspace.id
+        )
+
+        for doc, score in zip(docs, novelty, strict=True):
+            self.assertAlmostEqual(score, compute_novelty_score(doc), places=5)
+
+    def test_bulk_bias_and_source_weight_match_per_document(self):
+        """Test bulk feedback bias / source weight helpers agree with the per-document ones."""
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                content="c",
+            )
+            for i in range(3)
+        ]
+        heavy = Source.objects.create(
+            workspace=self.workspace, name="Heavy", provider_type="rss", weight=2.0
+        )
+        light = Source.objects.create(
+            workspace=self.workspace, name="Light", provider_type="rss", weight=0.5
+        )
+        DocumentSource.objects.create(document=docs[0], source=heavy)
+        DocumentSource.objects.create(document=docs[0], source=light)
+        DocumentSource.objects.create(document=docs[1], source=light)
+        WorkspaceCoreFeedback.objects.create(
+            workspace=self.workspace, document=docs[0], vote="down"
+        )
+        WorkspaceCoreFeedback.objects.create(workspace=self.workspace, document=docs[0], vote="up")
+        WorkspaceCoreFeedback.objects.create(
+            workspace=self.workspace, document=docs[1], vote="down"
+        )
+
+        ids = [doc.id for doc in docs]
+        with self.assertNumQueries(2):
+            bias = compute_feedback_bias_bulk(ids, self.workspace)
+            weights = compute_source_weight_bulk(ids)
+
+        for doc in docs:
+            self.assertEqual(bias[doc.id], compute_feedback_bias(doc, self.workspace))
+            self.assertAlmostEqual(weights[doc.id], compute_source_weight(doc))
+        self.assertEqual(bias[docs[0].id], 1.0)
+        self.assertAlmostEqual(weights[docs[0].id], 1.25)
+        self.assertEqual(weights[docs[2].id], 1.0)
+
+    def test_update_relevance_scores_matches_per_document(self):
+        """Test the single-UPDATE relevance path agrees with compute_relevance_score."""
+        scores = [(0.9, 0.8), (-0.4, 0.1), (1.0, 1.0), (None, 0.5)]
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                content="c",
+                alignment=alignment,
+                velocity=velocity,
+            )
+            for i, (alignment, velocity) in enumerate(scores)
+        ]
+        source = Source.objects.create(
+            workspace=self.workspace, name="Heavy", provider_type="rss", weight=3.0
+        )
+        DocumentSource.objects.create(document=docs[2], source=source)
+        WorkspaceCoreFeedback.objects.create(workspace=self.workspace, document=docs[0], vote="up")
+        WorkspaceCoreFeedback.objects.create(
+            workspace=self.workspace, document=docs[1], vote="down"
+        )
+
+        with self.assertNumQueries(1):
+            updated = update_relevance_scores(self.workspace.documents.all(), self.workspace)
+
+        self.assertEqual(updated, len(docs))
+        for doc in docs:
+            doc.refresh_from_db()
+            self.assertAlmostEqual(doc.relevance, compute_relevance_score(doc, self.workspace))
+        self.assertEqual(docs[2].relevance, 1.0)  # Clamped
+        self.assertEqual(docs[3].relevance, 0.0)  # Missing alignment
+
     def test_compute_velocity_score(self):
         """Test velocity score computation."""
         # Recent document
@@ -103,6 +342,36 @@ class ScoringServiceTest(TestCase):
         score = compute_velocity_score(old_doc, days_window=7)
         self.assertEqual(score, 0.0)
 
+    def test_compute_velocity_scores_bulk_matches_per_document(self):
+        """Test the vectorized velocity scores agree with compute_velocity_score."""
+        now = timezone.now()
+        timestamps = [
+            {"published_at": now - timedelta(days=2)},
+            {"published_at": now - timedelta(days=30)},
+            {"ingested_at": now - timedelta(hours=6)},
+            {"published_at": now + timedelta(days=1)},
+            {},
+        ]
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                content="Content",
+                **fields,
+            )
+            for i, fields in enumerate(timestamps)
+        ]
+
+        with self.assertNumQueries(1):
+            scores = compute_velocity_scores_bulk(self.workspace.documents.all())
+
+        self.assertEqual(set(scores), {doc.id for doc in docs})
+        for doc in docs:
+            self.assertAlmostEqual(scores[doc.id], compute_velocity_score(doc), places=4)
+        self.assertEqual(scores[docs[3].id], 1.0)  # Future dates clamp to 1
+        self.assertEqual(scores[docs[4].id], 0.0)  # No timestamp
+
     def test_compute_cluster_velocity_score(self):
         """Test cluster velocity score."""
         cluster = Cluster.objects.create(workspace=self.workspace, centroid=[0.1] * 384, size=0)
@@ -122,3 +391,19 @@ class ScoringServiceTest(TestCase):
         score = compute_cluster_velocity_score(cluster, days_window=7)
         self.assertGreaterEqual(score, 0.0)
         self.assertLessEqual(score, 1.0)
+
+    def test_compute_cluster_velocity_score_counts_recent_share(self):
+        """Test cluster velocity is the recent share of members, from a single query."""
+        cluster = Cluster.objects.create(workspace=self.workspace, centroid=[0.1] * 384, size=2)
+        for i in range(2):
+            doc = Document.objects.create(
+                workspace=self.workspace, title=f"Doc {i}", url=f"http://example.com/{i}"
+            )
+            ClusterMembership.objects.create(document=doc, cluster=cluster)
+        ClusterMembership.objects.filter(document__title="Doc 0").update(
+            assigned_at=timezone.now() - timedelta(days=30)
+        )
+
+        with self.assertNumQueries(1):
+            score = compute_cluster_velocity_score(cluster, days_window=7)
+        self.assertEqual(score, 0.5)
@@ -0,0 +1,69 @@
+"""
+Tests for the summarization service.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from canopyresearch.models import Document, Workspace, WorkspaceSearchTerms
+from canopyresearch.services.summarization import summarize_document, summarize_documents
+
+User = get_user_model()
+
+
+def _chat_response(text):
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = f" {text} "
+    return response
+
+
+class SummarizationTest(TestCase):
+    """Test document summarization."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.workspace = Workspace.objects.create(
+            name="Test Workspace", description="Test", owner=self.user
+        )
+        WorkspaceSearchTerms.objects.create(
+            workspace=self.workspace, term="agents", source="manual", weight=1.0
+        )
+        self.docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                content=f"Content {i}",
+            )
+            for i in range(3)
+        ]
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_no_api_key_returns_empty_summaries(self):
+        """Without an API key nothing is requested."""
+        self.assertEqual(summarize_document(self.docs[0]), "")
+        self.assertEqual(summarize_documents(self.docs), ["", "", ""])
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"})
+    @patch("openai.OpenAI")
+    def test_summarize_documents_keeps_order_and_reads_terms_once(self, mock_openai):
+        """Batch summaries come back in document order; search terms are queried once."""
+
+        def create(**kwargs):
+            prompt = kwargs["messages"][1]["content"]
+            if "Doc 1" in prompt:
+                raise RuntimeError("API error")
+            self.assertIn("Key topics: agents", prompt)
+            return _chat_response(prompt.split("Title: ")[1].split("\n")[0])
+
+        mock_openai.return_value.chat.completions.create.side_effect = create
+
+        with self.assertNumQueries(1):
+            summaries = summarize_documents(self.docs, max_workers=3)
+
+        self.assertEqual(summaries, ["Doc 0", "", "Doc 2"])
+        mock_openai.assert_called_once()
+        self.assertEqual(summarize_document(self.docs[2]), "Doc 2")
@@ -4,16 +4,43 @@ Tests for canopyresearch background tasks.
 
 from unittest.mock import MagicMock, patch
 
+import requests
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from canopyresearch.models import Document, Source, Workspace
+from canopyresearch.models import (
+    Cluster,
+    ClusterMembership,
+    Document,
+    DocumentSource,
+    EmbeddingCache,
+    Source,
+    Workspace,
+    WorkspaceCoreFeedback,
+    WorkspaceSearchTerms,
+)
 from canopyresearch.tasks import (
+    RETRY_BASE_DELAY_SECONDS,
+    TASK_MAX_RETRIES,
+    _assign_cluster,
+    _assign_clusters_batch,
+    _extract_and_embed_document,
+    _extract_and_embed_documents_batch,
+    _prefetched_batches,
+    _retry_later,
+    _score_document,
+    cleanup_old_documents,
     task_assign_cluster,
     task_extract_and_embed_document,
+    task_ingest_source,
     task_ingest_workspace,
     task_process_document,
+    task_process_documents,
+    task_process_workspace,
+    task_recompute_novelty,
     task_score_document,
     task_update_workspace_core,
 )
@@ -178,6 +205,7 @@ class DocumentProcessingTasksTest(TestCase):
         mock_backend = MagicMock()
         mock_backend.embed_texts.return_value = [[0.1] * 384]
         mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
         mock_backend.embedding_dim = 384
         mock_get_backend.return_value = mock_backend
 
@@ -187,6 +215,143 @@ class DocumentProcessingTasksTest(TestCase):
         doc.refresh_from_db()
         self.assertEqual(len(doc.embedding), 384)
 
+    @patch("canopyresearch.tasks.summarize_document", return_value="A summary")
+    @patch("canopyresearch.tasks.extract_links_from_url", return_value=[("http://a.com", "A")])
+    @patch("canopyresearch.tasks.extract_and_clean_content", return_value="Longer cleaned content")
+    @patch("canopyresearch.tasks.get_embedding_backend")
+    def test_extract_and_embed_writes_document_once(self, mock_get_backend, *_):
+        """Content, links, summary, and embedding are stored with a single UPDATE."""
+        doc = Document.objects.create(
+            workspace=self.workspace,
+            title="Test Doc",
+            url="http://example.com",
+            content="Short",
+        )
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.return_value = [[0.1] * 384]
+        mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
+        mock_backend.embedding_dim = 384
+        mock_get_backend.return_value = mock_backend
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(_extract_and_embed_document(document=doc)["status"], "success")
+        document_table = Document._meta.db_table
+        updates = [q for q in queries if q["sql"].startswith(f'UPDATE "{document_table}"')]
+        self.assertEqual(len(updates), 1)
+
+        doc.refresh_from_db()
+        self.assertEqual(doc.content, "Longer cleaned content")
+        self.assertEqual(doc.summary, "A summary")
+        self.assertEqual(doc.metadata["extracted_links"], [{"url": "http://a.com", "text": "A"}])
+        self.assertTrue(doc.has_embedding)
+
+    @patch("canopyresearch.tasks.summarize_document", return_value="")
+    @patch("canopyresearch.tasks.extract_links_from_url", return_value=[])
+    @patch("canopyresearch.tasks.extract_and_clean_content", return_value="Original content!")
+    @patch("canopyresearch.tasks.get_embedding_backend")
+    def test_marginally_longer_cleaned_content_is_not_written(self, mock_get_backend, *_):
+        """Cleaned content under CONTENT_REPLACE_MIN_GROWTH longer leaves content unwritten."""
+        doc = Document.objects.create(
+            workspace=self.workspace,
+            title="Test Doc",
+            url="http://example.com",
+            content="Original content",
+        )
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+        mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
+        mock_backend.embedding_dim = 384
+        mock_get_backend.return_value = mock_backend
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(_extract_and_embed_document(document=doc)["status"], "success")
+            _extract_and_embed_documents_batch([doc.pk])
+        document_table = Document._meta.db_table
+        updates = [q["sql"] for q in queries if q["sql"].startswith(f'UPDATE "{document_table}"')]
+        self.assertEqual(len(updates), 2)
+        for sql in updates:
+            self.assertNotIn('"content"', sql)
+
+        doc.refresh_from_db()
+        self.assertEqual(doc.content, "Original content")
+        self.assertTrue(doc.has_embedding)
+
+    @patch("canopyresearch.tasks.summarize_document", return_value="")
+    @patch("canopyresearch.tasks.extract_links_from_url", return_value=[("http://a.com", "A")])
+    @patch("canopyresearch.tasks.get_embedding_backend")
+    def test_embedding_merges_metadata_keys_written_concurrently(self, mock_get_backend, *_):
+        """Pipeline metadata is merged into the row, keeping keys written after it was read."""
+        doc = Document.objects.create(
+            workspace=self.workspace,
+            title="Test Doc",
+            url="http://example.com",
+            content="Test content",
+            metadata={"author": "before"},
+        )
+        other = Document.objects.create(
+            workspace=self.workspace,
+            title="Other Doc",
+            url="http://example.com/other",
+            content="Other content",
+        )
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+        mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
+        mock_backend.embedding_dim = 384
+        mock_get_backend.return_value = mock_backend
+
+        stale = Document.objects.get(pk=doc.pk)
+        # Another writer updates metadata between this read and the pipeline's write
+        Document.objects.filter(pk__in=[doc.pk, other.pk]).update(
+            metadata={"author": "after", "tags": ["new"]}
+        )
+        self.assertEqual(_extract_and_embed_document(document=stale)["status"], "success")
+        self.assertEqual(stale.metadata["author"], "before")
+        results = _extract_and_embed_documents_batch([other.pk])
+        self.assertEqual(results[other.pk]["status"], "success")
+
+        for document in (doc, other):
+            document.refresh_from_db()
+            self.assertEqual(document.metadata["author"], "after")
+            self.assertEqual(document.metadata["tags"], ["new"])
+            self.assertEqual(document.metadata["embedding_model"], "test-model")
+            self.assertEqual(document.metadata["embedding_dim"], 384)
+            self.assertEqual(
+                document.metadata["extracted_links"], [{"url": "http://a.com", "text": "A"}]
+            )
+
+    @patch("canopyresearch.tasks.summarize_document", return_value="")
+    @patch("canopyresearch.tasks.extract_links_from_url", return_value=[])
+    @patch("canopyresearch.tasks.get_embedding_backend")
+    def test_pipeline_stages_reuse_passed_document(self, mock_get_backend, *_):
+        """Test stages given a document instance update it without refetching by id."""
+        doc = Document.objects.create(
+            workspace=self.workspace,
+            title="Test Doc",
+            url="http://example.com",
+            content="Test content",
+        )
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.return_value = [[0.1] * 384]
+        mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
+        mock_backend.embedding_dim = 384
+        mock_get_backend.return_value = mock_backend
+
+        with patch.object(Document.objects, "get", side_effect=AssertionError("refetched")):
+            self.assertEqual(_extract_and_embed_document(document=doc)["status"], "success")
+            self.assertEqual(_assign_cluster(document=doc)["status"], "success")
+            self.assertEqual(_score_document(document=doc)["status"], "success")
+
+        self.assertEqual(len(doc.embedding), 384)
+        doc.refresh_from_db()
+        self.assertIsNotNone(doc.relevance)
+        # Scoring saw the membership clustering just created (own cluster excluded)
+        self.assertEqual(doc.novelty, 1.0)
+
     def test_task_assign_cluster(self):
         """Test cluster assignment task."""
         doc = Document.objects.create(
@@ -219,6 +384,31 @@ class DocumentProcessingTasksTest(TestCase):
         self.assertIn("scores", result.return_value)
         self.assertIn("alignment", result.return_value["scores"])
 
+    def test_score_document_loads_only_scoring_columns(self):
+        """Scoring by id skips wide document and workspace columns and never refetches."""
+        self.workspace.core_centroid = {"vector": [1.0, 0.0]}
+        self.workspace.save()
+        doc = Document.objects.create(
+            workspace=self.workspace,
+            title="Test Doc",
+            url="http://example.com",
+            content="Test content",
+            embedding=[1.0, 0.0],
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            result = _score_document(doc.id)
+        self.assertEqual(result["status"], "success")
+        self.assertAlmostEqual(result["scores"]["alignment"], 1.0, places=5)
+
+        load = queries[0]["sql"]
+        self.assertIn('"core_centroid"', load)
+        for column in ('"content"', '"raw_payload"', '"description"'):
+            self.assertNotIn(column, load)
+        document_table = Document._meta.db_table
+        selects = [q for q in queries if q["sql"].startswith("SELECT")]
+        self.assertFalse(any(f'FROM "{document_table}" WHERE' in q["sql"] for q in selects[1:]))
+
     @patch("canopyresearch.services.embeddings.get_embedding_backend")
     def test_task_update_workspace_core(self, mock_get_backend):
         """Test workspace core update task."""
@@ -243,6 +433,37 @@ class DocumentProcessingTasksTest(TestCase):
         self.workspace.refresh_from_db()
         self.assertIsNotNone(self.workspace.core_centroid)
 
+    def test_task_update_workspace_core_skips_rescore_when_core_unchanged(self):
+        """A core that barely moves only refreshes relevance of voted documents."""
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                embedding=[1.0, 0.0],
+                alignment=1.0,
+                velocity=0.0,
+            )
+            for i in range(2)
+        ]
+        for doc in docs:
+            WorkspaceCoreFeedback.objects.create(workspace=self.workspace, document=doc, vote="up")
+
+        with patch("canopyresearch.tasks.task_rescore_workspace") as mock_rescore:
+            self.workspace.core_centroid = {"vector": [2.0, 0.0]}
+            self.workspace.save()
+            result = task_update_workspace_core.enqueue(workspace_id=self.workspace.id)
+            self.assertTrue(result.return_value["skipped_rescore"])
+            mock_rescore.enqueue.assert_not_called()
+            docs[0].refresh_from_db()
+            self.assertIsNotNone(docs[0].relevance)
+
+            self.workspace.core_centroid = {"vector": [0.0, 1.0]}
+            self.workspace.save()
+            result = task_update_workspace_core.enqueue(workspace_id=self.workspace.id)
+            self.assertNotIn("skipped_rescore", result.return_value)
+            mock_rescore.enqueue.assert_called_once_with(workspace_id=self.workspace.id)
+
     @patch("canopyresearch.tasks.get_embedding_backend")
     def test_task_process_document(self, mock_get_backend):
         """Test full document processing pipeline."""
@@ -256,9 +477,417 @@ class DocumentProcessingTasksTest(TestCase):
         mock_backend = MagicMock()
         mock_backend.embed_texts.return_value = [[0.1] * 384]
         mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
         mock_backend.embedding_dim = 384
         mock_get_backend.return_value = mock_backend
 
         result = task_process_document.enqueue(document_id=doc.id)
         self.assertEqual(result.return_value["status"], "success")
         self.assertIn("results", result.return_value)
+
+    @patch("canopyresearch.tasks.summarize_document", return_value="")
+    @patch("canopyresearch.tasks.extract_links_from_url", return_value=[])
+    @patch("canopyresearch.tasks.get_embedding_backend")
+    def test_task_process_document_writes_document_once(self, mock_get_backend, *_):
+        """The in-process pipeline stores content, embedding, and scores in one UPDATE."""
+        doc = Document.objects.create(
+            workspace=self.workspace,
+            title="Test Doc",
+            url="http://example.com",
+            content="Test content",
+        )
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.return_value = [[0.1] * 384]
+        mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
+        mock_backend.embedding_dim = 384
+        mock_get_backend.return_value = mock_backend
+
+        with CaptureQueriesContext(connection) as queries:
+            result = task_process_document.enqueue(document_id=doc.id)
+        self.assertEqual(result.return_value["status"], "success")
+        document_table = Document._meta.db_table
+        updates = [q for q in queries if q["sql"].startswith(f'UPDATE "{document_table}"')]
+        self.assertEqual(len(updates), 1)
+
+        doc.refresh_from_db()
+        self.assertTrue(doc.has_embedding)
+        self.assertIsNotNone(doc.relevance)
+        self.assertIsNotNone(doc.scored_at)
+
+    @patch("canopyresearch.tasks.summarize_document", return_value="")
+    @patch("canopyresearch.tasks.extract_links_from_url", return_value=[])
+    @patch("canopyresearch.tasks.get_embedding_backend")
+    def test_task_process_workspace_embeds_in_batches(self, mock_get_backend, *_):
+        """Test workspace backfill embeds documents with one backend call per batch."""
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                content=f"Content {i}",
+            )
+            for i in range(3)
+        ]
+
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+        mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
+        mock_backend.embedding_dim = 384
+        mock_get_backend.return_value = mock_backend
+
+        # The immediate test backend runs the enqueued batch task inline
+        result = task_process_workspace.enqueue(workspace_id=self.workspace.id)
+        self.assertEqual(result.return_value["status"], "enqueued")
+        self.assertEqual(result.return_value["total"], 3)
+        self.assertEqual(result.return_value["batches"], 1)
+        mock_backend.embed_texts.assert_called_once()
+
+        for doc in docs:
+            doc.refresh_from_db()
+            self.assertEqual(len(doc.embedding), 384)
+            self.assertEqual(doc.metadata["embedding_model"], "test-model")
+            self.assertIsNotNone(doc.relevance)
+
+    @patch("canopyresearch.tasks.summarize_document", return_value="")
+    @patch("canopyresearch.tasks.extract_links_from_url", return_value=[])
+    @patch("canopyresearch.tasks.get_embedding_backend")
+    def test_embed_batch_loads_documents_with_one_narrow_query(self, mock_get_backend, *_):
+        """The batch reads only the columns it needs and never refetches deferred ones."""
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                content=f"Content {i}",
+                raw_payload={"large": "x" * 1000},
+            )
+            for i in range(3)
+        ]
+        mock_backend = MagicMock()
+        # Second document fails to embed, so bulk_update also writes its unset fields
+        mock_backend.embed_texts.return_value = [[0.1] * 384, [], [0.1] * 384]
+        mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
+        mock_backend.embedding_dim = 384
+        mock_get_backend.return_value = mock_backend
+
+        with CaptureQueriesContext(connection) as queries:
+            results = _extract_and_embed_documents_batch([doc.id for doc in docs])
+
+        self.assertEqual(
+            [results[doc.id]["status"] for doc in docs], ["success", "error", "success"]
+        )
+        document_table = Document._meta.db_table
+        selects = [q["sql"] for q in queries if f'FROM "{document_table}"' in q["sql"]]
+        self.assertEqual(len(selects), 1)
+        self.assertNotIn("raw_payload", selects[0])
+
+    @patch("canopyresearch.tasks.EMBED_BATCH_SIZE", 2)
+    @patch("canopyresearch.tasks.task_process_documents")
+    def test_task_process_workspace_pages_pending_ids(self, mock_process):
+        """Pending IDs are read a batch at a time and each batch is enqueued in id order."""
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace, title=f"Doc {i}", url=f"http://example.com/{i}"
+            )
+            for i in range(3)
+        ]
+
+        result = task_process_workspace.enqueue(workspace_id=self.workspace.id)
+
+        self.assertEqual(result.return_value["total"], 3)
+        self.assertEqual(result.return_value["batches"], 2)
+        enqueued = [c.kwargs["document_ids"] for c in mock_process.enqueue.call_args_list]
+        self.assertEqual(enqueued, [[docs[0].id, docs[1].id], [docs[2].id]])
+
+    @patch("canopyresearch.tasks.summarize_document", return_value="")
+    @patch("canopyresearch.tasks.extract_links_from_url", return_value=[])
+    @patch("canopyresearch.tasks.get_embedding_backend")
+    def test_task_process_documents_skips_already_embedded(self, mock_get_backend, *_):
+        """A batch only embeds documents still pending, e.g. after an overlapping run."""
+        pending = Document.objects.create(
+            workspace=self.workspace, title="Pending", url="http://example.com/1", content="A"
+        )
+        done = Document.objects.create(
+            workspace=self.workspace,
+            title="Done",
+            url="http://example.com/2",
+            content="B",
+            embedding=[0.2] * 384,
+        )
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+        mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
+        mock_backend.embedding_dim = 384
+        mock_get_backend.return_value = mock_backend
+
+        result = task_process_documents.enqueue(
+            workspace_id=self.workspace.id, document_ids=[pending.id, done.id]
+        )
+
+        self.assertEqual(result.return_value["processed"], 1)
+        self.assertEqual(result.return_value["skipped"], 1)
+        self.assertEqual(result.return_value["errors"], 0)
+        mock_backend.embed_texts.assert_called_once_with(["A"])
+        done.refresh_from_db()
+        self.assertEqual(done.embedding, [0.2] * 384)
+
+    @patch("canopyresearch.tasks.summarize_document", return_value="")
+    @patch("canopyresearch.tasks.extract_links_from_url", return_value=[])
+    @patch("canopyresearch.tasks.get_embedding_backend")
+    def test_task_process_documents_embeds_outside_transaction(self, mock_get_backend, *_):
+        """The embedding call holds no transaction; rows embedded meanwhile are skipped."""
+        mine = Document.objects.create(
+            workspace=self.workspace, title="Mine", url="http://example.com/1", content="A"
+        )
+        theirs = Document.objects.create(
+            workspace=self.workspace, title="Theirs", url="http://example.com/2", content="B"
+        )
+        outer_blocks = len(connection.atomic_blocks)
+        atomic_depths = []
+
+        def embed_texts(texts):
+            atomic_depths.append(len(connection.atomic_blocks))
+            # Another worker finishes this document while the batch is on the network
+            Document.objects.filter(pk=theirs.pk).update(embedding=[0.2] * 384, has_embedding=True)
+            return [[0.1] * 384 for _ in texts]
+
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = embed_texts
+        mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
+        mock_backend.embedding_dim = 384
+        mock_get_backend.return_value = mock_backend
+
+        result = task_process_documents.enqueue(
+            workspace_id=self.workspace.id, document_ids=[mine.id, theirs.id]
+        )
+
+        self.assertEqual(atomic_depths, [outer_blocks])
+        self.assertEqual(result.return_value["processed"], 1)
+        self.assertEqual(result.return_value["skipped"], 1)
+        mine.refresh_from_db()
+        theirs.refresh_from_db()
+        self.assertTrue(mine.has_embedding)
+        self.assertEqual(theirs.embedding, [0.2] * 384)
+        self.assertEqual(ClusterMembership.objects.filter(document=theirs).count(), 0)
+
+    @patch("canopyresearch.tasks.score_documents_bulk", side_effect=RuntimeError("boom"))
+    @patch("canopyresearch.tasks.summarize_document", return_value="")
+    @patch("canopyresearch.tasks.extract_links_from_url", return_value=[])
+    @patch("canopyresearch.tasks.get_embedding_backend")
+    def test_task_process_documents_keeps_embeddings_when_scoring_fails(self, mock_get_backend, *_):
+        """A failed step inside the batch's write transaction does not roll back earlier steps."""
+        doc = Document.objects.create(
+            workspace=self.workspace, title="Doc", url="http://example.com/1", content="A"
+        )
+        outer_blocks = len(connection.atomic_blocks)
+        atomic_depths = {}
+
+        def embed_texts(texts):
+            atomic_depths["embedding"] = len(connection.atomic_blocks)
+            return [[0.1] * 384 for _ in texts]
+
+        def assign_clusters_batch(document_ids):
+            atomic_depths["clustering"] = len(connection.atomic_blocks)
+            return _assign_clusters_batch(document_ids)
+
+        mock_backend = MagicMock()
+        mock_backend.embed_texts.side_effect = embed_texts
+        mock_backend.model_name = "test-model"
+        mock_backend.api_base = ""
+        mock_backend.embedding_dim = 384
+        mock_get_backend.return_value = mock_backend
+
+        with patch("canopyresearch.tasks._assign_clusters_batch", assign_clusters_batch):
+            result = task_process_documents.enqueue(
+                workspace_id=self.workspace.id, document_ids=[doc.id]
+            )
+
+        # Only the database writes share the batch transaction, clustering in a savepoint
+        self.assertEqual(atomic_depths, {"embedding": outer_blocks, "clustering": outer_blocks + 2})
+        self.assertEqual(result.return_value["processed"], 1)
+        doc.refresh_from_db()
+        self.assertTrue(doc.has_embedding)
+        self.assertEqual(ClusterMembership.objects.filter(document=doc).count(), 1)
+
+    @patch("canopyresearch.tasks.RELEVANCE_UPDATE_CHUNK", 1)
+    def test_task_recompute_novelty_writes_novelty_and_relevance(self):
+        """Test novelty recompute stores novelty and relevance for every embedded document."""
+        Cluster.objects.create(workspace=self.workspace, centroid=[0.0, 1.0], size=1)
+        docs = [
+            Document.objects.create(
+                workspace=self.workspace,
+                title=f"Doc {i}",
+                url=f"http://example.com/{i}",
+                content="Content",
+                embedding=embedding,
+                alignment=0.5,
+                velocity=0.5,
+            )
+            for i, embedding in enumerate([[1.0, 0.0], [0.0, 1.0]])
+        ]
+
+        # One document per page, so the keyset paging crosses a page boundary
+        result = task_recompute_novelty.enqueue(workspace_id=self.workspace.id)
+        self.assertEqual(result.return_value["recomputed"], 2)
+        self.assertEqual(result.return_value["total"], 2)
+
+        for doc in docs:
+            doc.refresh_from_db()
+            self.assertIsNotNone(doc.scored_at)
+            self.assertAlmostEqual(doc.relevance, 0.7 * 0.75 + 0.2 * 0.5 + 0.1 * 0.5)
+        self.assertAlmostEqual(docs[0].novelty, 1.0)
+        self.assertAlmostEqual(docs[1].novelty, 0.0, places=5)
+
+
+class CleanupOldDocumentsTest(TestCase):
+    """Test cleanup_old_documents."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.workspace = Workspace.objects.create(name="Test Workspace", owner=self.user)
+        self.source = Source.objects.create(
+            workspace=self.workspace, name="Feed", provider_type="rss", config={}
+        )
+        self.cluster = Cluster.objects.create(workspace=self.workspace, centroid=[1.0], size=2)
+
+    def _create_document(self, index, days_old):
+        doc = Document.objects.create(
+            workspace=self.workspace,
+            title=f"Doc {index}",
+            url=f"http://example.com/{index}",
+            published_at=timezone.now() - timezone.timedelta(days=days_old),
+        )
+        DocumentSource.objects.create(document=doc, source=self.source)
+        ClusterMembership.objects.create(document=doc, cluster=self.cluster)
+        WorkspaceCoreFeedback.objects.create(workspace=self.workspace, document=doc, vote="up")
+        return doc
+
+    @patch("canopyresearch.tasks.CLEANUP_BATCH_SIZE", 2)
+    def test_cleanup_old_documents_removes_dependents_in_batches(self):
+        """Old documents and their dependent rows are removed; newer ones are kept."""
+        old_docs = [self._create_document(i, days_old=120) for i in range(3)]
+        recent = self._create_document(3, days_old=1)
+        term = WorkspaceSearchTerms.objects.create(
+            workspace=self.workspace, term="topic", source="document", document=old_docs[0]
+        )
+
+        deleted = cleanup_old_documents(self.workspace.id, days_old=90)
+
+        self.assertEqual(deleted, 3)
+        self.assertEqual(list(Document.objects.values_list("id", flat=True)), [recent.id])
+        self.assertEqual(DocumentSource.objects.get().document_id, recent.id)
+        self.assertEqual(ClusterMembership.objects.get().document_id, recent.id)
+        self.assertEqual(WorkspaceCoreFeedback.objects.get().document_id, recent.id)
+        term.refresh_from_db()
+        self.assertIsNone(term.document_id)
+
+    def test_cleanup_old_documents_prunes_embedding_cache(self):
+        """Embedding cache entries older than the cutoff are deleted; newer ones kept."""
+        for content_hash in ("old", "new"):
+            EmbeddingCache.objects.create(
+                content_hash=content_hash, model_name="test-model", dimension=1, vector=[1.0]
+            )
+        EmbeddingCache.objects.filter(content_hash="old").update(
+            created_at=timezone.now() - timezone.timedelta(days=120)
+        )
+
+        cleanup_old_documents(self.workspace.id, days_old=90)
+
+        self.assertEqual(
+            list(EmbeddingCache.objects.values_list("content_hash", flat=True)), ["new"]
+        )
+
+
+DEFERRING_TASKS = {
+    "default": {
+        "BACKEND": "django_tasks.backends.dummy.DummyBackend",
+        "QUEUES": ["default", "io"],
+    }
+}
+
+
+class TaskRetryTest(TestCase):
+    """Test backoff retries of network-bound tasks (on a backend that supports run_after)."""
+
+    @override_settings(TASKS=DEFERRING_TASKS)
+    def test_retry_later_enqueues_next_attempt_with_backoff(self):
+        """A retry is deferred by RETRY_BASE_DELAY_SECONDS * 2**attempt, up to the limit."""
+        before = timezone.now()
+        self.assertTrue(_retry_later(task_ingest_source, 2, source_id=7))
+
+        [result] = task_ingest_source.get_backend().results
+        self.assertEqual(result.kwargs, {"attempt": 3, "source_id": 7})
+        delay = (result.task.run_after - before).total_seconds()
+        self.assertAlmostEqual(delay, RETRY_BASE_DELAY_SECONDS * 4, delta=5)
+
+        self.assertFalse(_retry_later(task_ingest_source, TASK_MAX_RETRIES, source_id=7))
+
+    @override_settings(TASKS=DEFERRING_TASKS)
+    @patch("canopyresearch.tasks.ingest_source")
+    def test_task_ingest_source_retries_only_transient_errors(self, mock_ingest):
+        """Connection errors schedule a retry; other errors still fail the task."""
+        user = User.objects.create_user(username="testuser", password="testpass")
+        workspace = Workspace.objects.create(name="Test Workspace", owner=user)
+        source = Source.objects.create(
+            workspace=workspace, name="Feed", provider_type="rss", config={}
+        )
+
+        mock_ingest.side_effect = requests.ConnectionError("reset")
+        self.assertEqual(task_ingest_source.call(source_id=source.id), (0, 0))
+        [result] = task_ingest_source.get_backend().results
+        self.assertEqual(result.kwargs, {"attempt": 1, "source_id": source.id})
+
+        mock_ingest.side_effect = ValueError("bad feed")
+        with self.assertRaises(ValueError):
+            task_ingest_source.call(source_id=source.id)
+
+    @override_settings(TASKS=DEFERRING_TASKS)
+    @patch("canopyresearch.tasks.ingest_source")
+    def test_task_ingest_source_stops_retrying_paused_source(self, mock_ingest):
+        """A failure that pauses the source is not retried, and pending retries are dropped."""
+        user = User.objects.create_user(username="testuser", password="testpass")
+        workspace = Workspace.objects.create(name="Test Workspace", owner=user)
+        source = Source.objects.create(
+            workspace=workspace, name="Feed", provider_type="rss", config={}
+        )
+
+        def fail_and_pause(source):
+            source.status = "paused"
+            source.save(update_fields=["status"])
+            raise requests.ConnectionError("reset")
+
+        mock_ingest.side_effect = fail_and_pause
+        with self.assertRaises(requests.ConnectionError):
+            task_ingest_source.call(source_id=source.id)
+        self.assertEqual(task_ingest_source.get_backend().results, [])
+
+        mock_ingest.reset_mock()
+        self.assertEqual(task_ingest_source.call(source_id=source.id, attempt=2), (0, 0))
+        mock_ingest.assert_not_called()
+
+
+class PrefetchedBatchesTest(SimpleTestCase):
+    """Test the background batch loader used by task_rescore_workspace."""
+
+    def test_yields_every_batch_in_order_with_errors_in_place(self):
+        """Batches load ahead in a thread but are yielded in order; failures are yielded."""
+        error = ValueError("boom")
+
+        def load(batch):
+            if batch == [3]:
+                raise error
+            return [n * 10 for n in batch]
+
+        batches = [[1, 2], [3], [4], [5, 6]]
+        results = list(_prefetched_batches(load, batches, lookahead=2))
+
+        self.assertEqual([batch for batch, _ in results], batches)
+        self.assertEqual(results[0][1], [10, 20])
+        self.assertIs(results[1][1], error)
+        self.assertEqual(results[3][1], [50, 60])
@@ -344,6 +344,21 @@ class SourceCRUDViewTest(TestCase):
         self.assertNotContains(response, "workspace_detail")
         self.assertNotContains(response, "<html")
 
+    def test_workspace_tabs_swap_partials_and_render_full_shell(self):
+        """Each tab returns a bare fragment to htmx and the full workspace page otherwise."""
+        for name in ("source_list", "document_list", "cluster_list"):
+            with self.subTest(tab=name):
+                url = reverse(name, args=[self.workspace.id])
+                partial = self.client.get(url, HTTP_HX_REQUEST="true")
+                self.assertEqual(partial.status_code, 200)
+                self.assertNotContains(partial, "<html")
+                self.assertNotContains(partial, 'id="tab-content"')
+
+                full = self.client.get(url)
+                self.assertEqual(full.status_code, 200)
+                self.assertContains(full, "<html")
+                self.assertContains(full, 'id="tab-content"')
+
     def test_document_list_htmx_returns_partial(self):
         """Test that document list returns partial when HX-Request header present."""
         response = self.client.get(
@@ -541,7 +541,7 @@ def workspace_core_seed(request, workspace_id):
     # GET: Show seed candidates
     seed_docs = workspace.core_seeds.select_related("document").all()
     # Get documents with embeddings for potential seeding
-    candidates = workspace.documents.exclude(embedding=[])[:20]
+    candidates = workspace.documents.filter(has_embedding=True)[:20]
 
     context = {
         "workspace": workspace,